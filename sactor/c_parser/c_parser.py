@@ -360,12 +360,10 @@ class CParser:
                 segments.append((cursor, func_end_b))
             if not segments:
                 return ""
-            parts = []
-            for a, b in segments:
-                start_s = utils.byte_to_str_index(b2s, a)
-                end_s = utils.byte_to_str_index(b2s, b)
-                parts.append(text_str[start_s:end_s])
-            return "".join(parts)
+            bounds = utils.byte_to_str_indices(
+                b2s, (off for segment in segments for off in segment))
+            return "".join(
+                text_str[bounds[i]:bounds[i + 1]] for i in range(0, len(bounds), 2))
         except Exception as exc:
             logger.debug("Failed to extract extent without skipped ranges: %s", exc)
             return self._render_extent_text(extent)
@@ -76,7 +76,7 @@ def remove_function_static_decorator(function_name: str, source_code: str) -> st
     return source_code
 
 
-def expand_all_macros(input_file, commands: list[list[str]] | None=None):
+def expand_all_macros(input_file, commands: list[list[str]] | None=None, jobs: int = 1):
     """
     Return:
     - no_test_output_filepath: source file for the translator
@@ -191,14 +191,14 @@ def expand_all_macros(input_file, commands: list[list[str]] | None=None):
 
     # check if it can compile, if not, will raise an error
     # assume it is a library, compatible with the executable
-    utils.compile_c_code(tmp_file_path, commands=commands, is_library=True)
+    utils.compile_c_code(tmp_file_path, commands=commands, is_library=True, jobs=jobs)
 
     return tmp_file_path
 
 
-def preprocess_source_code(input_file, commands: list[list[str]]) -> str:
+def preprocess_source_code(input_file, commands: list[list[str]], jobs: int = 1) -> str:
     # Expand all macros in the input file
-    expanded_file = expand_all_macros(input_file, commands)
+    expanded_file = expand_all_macros(input_file, commands, jobs)
     # Unfold all typedefs in the expanded file
     compile_flags = utils.get_compile_flags_from_commands(commands)
     include_flags = list(filter(lambda s: s.startswith("-I"), compile_flags))
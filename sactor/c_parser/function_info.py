@@ -47,6 +47,7 @@ class FunctionInfo:
         self.struct_dependency_refs: list[StructRef] = []
         self.enum_dependency_refs: list[EnumRef] = []
         self.global_dependency_refs: list[GlobalVarRef] = []
+        self._signature_cache: str | None = None
 
         self.stdio_list = []
 
@@ -58,13 +59,7 @@ class FunctionInfo:
         '''
         function_name_sub is used to substitute the function name in the signature
         '''
-        tokens = []
-        for token in utils.cursor_get_tokens(self.node):
-            if token.kind.name == 'PUNCTUATION' and token.spelling == '{':
-                break
-            tokens.append(token.spelling)
-
-        signature = ' '.join(tokens)
+        signature = self._signature_text()
 
         # If a function name substitution is requested, replace the original name
         if function_name_sub is not None:
@@ -72,6 +67,18 @@ class FunctionInfo:
 
         return signature.strip()
 
+    def _signature_text(self) -> str:
+        # The cursor is immutable for the lifetime of this object, so the
+        # tokens before the body are only fetched from libclang once.
+        if self._signature_cache is None:
+            tokens = []
+            for token in utils.cursor_get_tokens(self.node):
+                if token.kind.name == 'PUNCTUATION' and token.spelling == '{':
+                    break
+                tokens.append(token.spelling)
+            self._signature_cache = ' '.join(tokens)
+        return self._signature_cache
+
     def get_structs_in_signature(self) -> list[StructInfo]:
         struct_dependencies_tbl = {}
         for struct in self.struct_dependencies:
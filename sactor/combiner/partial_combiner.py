@@ -9,7 +9,15 @@ class PartialCombiner(Combiner):
     def __init__(self, functions: dict[str, str], data_types: dict[str, str]):
         self.functions = functions
         self.data_types = data_types
+        # Parsed snippets, so that combining again after editing
+        # `functions`/`data_types` only parses the snippets that changed
+        self._parsed: dict[str, RustCode] = {}
 
+    def _rust_code(self, code: str) -> RustCode:
+        parsed = self._parsed.get(code)
+        if parsed is None:
+            parsed = self._parsed[code] = RustCode(code)
+        return parsed
 
     @override
     def combine(self) -> tuple[CombineResult, Optional[str]]:
@@ -17,10 +25,10 @@ class PartialCombiner(Combiner):
         data_type_code: dict[str, RustCode] = {}
         # Initialize the function_code and struct_code dictionaries
         for function_name, f_code in self.functions.items():
-            function_code[function_name] = RustCode(f_code)
+            function_code[function_name] = self._rust_code(f_code)
 
         for dt_name, s_code in self.data_types.items():
-            data_type_code[dt_name] = RustCode(s_code)
+            data_type_code[dt_name] = self._rust_code(s_code)
 
         output_code = self._combine_code(function_code, data_type_code)
 
@@ -328,7 +328,8 @@ class ProjectCombiner:
                 import_lines.append(f"use crate::{owner_mod}::{fname};")
             import_block = "\n\n" + "\n".join(sorted(set(import_lines))) + ("\n\n" if import_lines else "")
             full_code = "#![allow(unused_imports, unused_variables, dead_code)]\n" + import_block + code
-            utils.save_code(out_path, full_code)
+            # Formatted together with the crate root by `cargo fmt` below
+            utils.save_code(out_path, full_code, format_now=False)
 
             # Entry TU handled later as main.rs; still declare mod for other TUs
             if not (entry_tu and os.path.samefile(tu_path, entry_tu)):
@@ -361,13 +362,13 @@ class ProjectCombiner:
             root.append("")
             root.append(entry_code)
             main_rs = "\n".join(root) + "\n"
-            utils.save_code(os.path.join(src_dir, "main.rs"), main_rs)
+            utils.save_code(os.path.join(src_dir, "main.rs"), main_rs, format_now=False)
         else:
             # No entry: build a library root that declares all modules
             root = ["#![allow(unused_imports, unused_variables, dead_code)]"]
             root.extend(module_decls)
             lib_rs = "\n".join(root) + "\n"
-            utils.save_code(os.path.join(src_dir, "lib.rs"), lib_rs)
+            utils.save_code(os.path.join(src_dir, "lib.rs"), lib_rs, format_now=False)
 
         # Build
         fmt = ["cargo", "fmt", "--manifest-path", os.path.join(crate_dir, "Cargo.toml")]
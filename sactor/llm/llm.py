@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import time
@@ -22,6 +23,9 @@ class LLM:
             config['general'].get('max_llm_input_tokens', 20480)
         )
 
+        cache_dir = config['general'].get('llm_cache_dir')
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+
         if not encoding:
             encoding = config['general']['encoding']
 
@@ -29,6 +33,9 @@ class LLM:
         self.costed_input_tokens = []
         self.costed_output_tokens = []
         self.costed_time = []
+        # Why the provider ended the last generation ("stop", "length", ...),
+        # None if unknown
+        self.last_finish_reason = None
 
         # Initialize litellm router with config
         self.default_model = config['general']['model']
@@ -45,13 +52,24 @@ class LLM:
             logging_params = utils.sanitize_config(params, redact=True)
             logger.debug("Model mapping %d: '%s' -> '%s': %s", i, model_name, litellm_model, logging_params)
 
+        # Sampling and routing parameters (credentials excluded) that shape a
+        # model's replies; part of the response cache key.
+        self._cache_params: dict[str, list] = {}
+        for model_config in model_list:
+            self._cache_params.setdefault(model_config.get('model_name'), []).append(
+                utils.sanitize_config(model_config.get('litellm_params', {}))
+            )
+        self._cache_router_settings = utils.sanitize_config(
+            litellm_config.get('router_settings', {})
+        )
+
         # Create router with model list and settings
         self.router = Router(
             model_list=model_list,
             **litellm_config.get('router_settings', {})
         )
 
-    def _query_impl(self, prompt, model=None) -> str:
+    def _query_impl(self, prompt, model=None, stop=None) -> str:
         if model is None:
             model = self.default_model
 
@@ -61,21 +79,58 @@ class LLM:
         messages.append({"role": "user", "content": prompt})
 
         try:
+            extra_params = {}
+            if stop:
+                # Providers without stop-sequence support simply ignore it
+                extra_params = {"stop": stop, "drop_params": True}
             response = self.router.completion(
                 model=model,
-                messages=messages
+                messages=messages,
+                **extra_params,
             )
-            content = response.choices[0].message.content
+            choice = response.choices[0]
+            content = choice.message.content
 
             if content is None:
                 raise Exception(f"Failed to generate response: {response}")
 
+            finish_reason = getattr(choice, "finish_reason", None)
+            self.last_finish_reason = finish_reason if isinstance(finish_reason, str) else None
+
             return content
 
         except Exception as e:
             raise Exception(f"LiteLLM router query failed for {model}: {str(e)}")
 
-    def query(self, prompt, model=None, override_system_message=None) -> str:
+    def _cache_path(self, prompt, model, stop=None) -> str | None:
+        if self.cache_dir is None:
+            return None
+        model = model or self.default_model
+        key_fields = [
+            model,
+            self.system_msg,
+            prompt,
+            self._cache_params.get(model, []),
+            self._cache_router_settings,
+        ]
+        if stop:
+            key_fields.append(stop)
+        key = hashlib.sha256(
+            json.dumps(key_fields, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def query(
+        self,
+        prompt,
+        model=None,
+        override_system_message=None,
+        stop: list[str] | None = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Query the LLM. With ``use_cache=False`` a cached response is never
+        served, e.g. when retrying after an earlier reply for the same prompt
+        failed; the fresh response still replaces the cache entry."""
         input_tokens = self.enc.encode(prompt)
         if len(input_tokens) > self.max_input_tokens:
             logger.warning(
@@ -90,16 +145,40 @@ class LLM:
             old_system_msg = self.system_msg
             self.system_msg = override_system_message
 
-        start_time = time.time()
-        response = self._query_impl(prompt, model)
-        end_time = time.time()
-        last_costed_time = end_time - start_time
-        self.costed_time.append(last_costed_time)
-
-        output_tokens = self.enc.encode(response)
-
-        self.costed_input_tokens.append(len(input_tokens))
-        self.costed_output_tokens.append(len(output_tokens))
+        cache_path = self._cache_path(prompt, model, stop)
+        response = None
+        self.last_finish_reason = None
+        if cache_path is not None and use_cache:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if not isinstance(cached, dict) or not isinstance(cached.get("response"), str):
+                    raise ValueError("malformed cache entry")
+                response = cached["response"]
+                self.last_finish_reason = cached.get("finish_reason")
+                logger.debug("Using cached LLM response %s", cache_path)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                # Treated as a miss; the entry is overwritten below
+                logger.warning("Ignoring unreadable LLM cache entry %s: %s", cache_path, e)
+
+        if response is None:
+            start_time = time.time()
+            response = self._query_impl(prompt, model, stop=stop)
+            end_time = time.time()
+            last_costed_time = end_time - start_time
+            self.costed_time.append(last_costed_time)
+
+            output_tokens = self.enc.encode(response)
+
+            self.costed_input_tokens.append(len(input_tokens))
+            self.costed_output_tokens.append(len(output_tokens))
+
+            if cache_path is not None:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                cached = {"response": response, "finish_reason": self.last_finish_reason}
+                utils.atomic_write_bytes(cache_path, json.dumps(cached).encode("utf-8"))
 
         sactor_logging.log_llm_response(response)
 
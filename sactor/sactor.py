@@ -179,7 +179,11 @@ class Sactor:
         else:
             self.processed_compile_commands = []
 
-        self.input_file_preprocessed = preprocess_source_code(input_file, self.processed_compile_commands)
+        self.input_file_preprocessed = preprocess_source_code(
+            input_file,
+            self.processed_compile_commands,
+            jobs=utils.parallel_jobs(self.config),
+        )
         self.test_cmd_path = test_cmd_path
         self.build_dir = os.path.join(
             utils.get_temp_dir(), "build") if build_dir is None else build_dir
@@ -22,3 +22,13 @@ class RustFmt(ThirdParty):
         result = utils.run_command(cmd, capture_output=False)
         if result.returncode != 0:
             raise OSError(f"Failed to format the file: {self.file_path}")
+
+    @staticmethod
+    def format_code(code: str) -> str:
+        """Format `code` through rustfmt's stdin and return the result."""
+        # Match the edition of the crates sactor generates.
+        cmd = ["rustfmt", "--edition", "2021", "--emit", "stdout"]
+        result = utils.run_command(cmd, input_data=code)
+        if result.returncode != 0:
+            raise OSError(f"Failed to format the code: {result.stderr}")
+        return result.stdout
@@ -1255,7 +1255,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
                 )
             # get the translated function signatures
             code = read_file(translated_path)
-            function_signatures = rust_ast_parser.get_func_signatures(code)
+            function_signatures = utils.get_func_signatures(code)
             resolved_name = self._resolve_dependency_decl_name(
                 dep_name, function_signatures
             )
@@ -1288,7 +1288,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
 
         unidiomatic_function_code = read_file(unidiomatic_function_path)
 
-        undiomantic_function_signatures = rust_ast_parser.get_func_signatures(
+        undiomantic_function_signatures = utils.get_func_signatures(
             unidiomatic_function_code)
         undiomantic_function_signature = undiomantic_function_signatures[function.name]
 
@@ -1595,7 +1595,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
             )
 
         try:
-            function_result_sigs = rust_ast_parser.get_func_signatures(
+            function_result_sigs = utils.get_func_signatures(
                 function_result)
         except Exception as e:
             error_message = f"Error: Syntax error in the translated code: {e}"
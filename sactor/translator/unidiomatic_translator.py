@@ -638,7 +638,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
                     f"Error: Dependency {dep_name} of function {function.name} is not translated yet")
 
             code = utils.read_file(translated_path)
-            function_signatures = rust_ast_parser.get_func_signatures(code)
+            function_signatures = utils.get_func_signatures(code)
             function_use = RustCode(code).used_code_list
             all_uses += function_use
 
@@ -870,7 +870,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
                     return (VerifyResult.COMPILE_ERROR, error_message), processed_code
 
                 try:
-                    function_result_sigs = rust_ast_parser.get_func_signatures(
+                    function_result_sigs = utils.get_func_signatures(
                         processed_code)
                 except Exception as e:
                     error_message = f"Error: Syntax error in the translated code: {e}"
@@ -1182,7 +1182,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
 
         # TODO: check function signature, must use pointers, not Box, etc.
         try:
-            function_result_sigs = rust_ast_parser.get_func_signatures(
+            function_result_sigs = utils.get_func_signatures(
                 function_result)
         except Exception as e:
             error_message = f"Error: Syntax error in the translated code: {e}"
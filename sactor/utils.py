@@ -1,21 +1,30 @@
-import os, copy
+import os
+import codecs
+import functools
+import glob
+import itertools
 import hashlib
+import json
 import shutil
 import tempfile
 import subprocess
-from typing import List, Tuple, Optional, Sequence
+from typing import Iterable, List, Tuple, Optional, Sequence
 from pathlib import Path
 from importlib import resources
 import re, shlex
-import tomli as toml
+try:
+    import tomllib as toml  # Python 3.11+
+except ImportError:  # pragma: no cover - Python < 3.11
+    import tomli as toml
 import sys
 import time
-import select
+import threading
 from sactor import logging as sactor_logging
 from sactor import rust_ast_parser
 from sactor.data_types import DataType
 from sactor.thirdparty.rustfmt import RustFmt
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from clang.cindex import (
@@ -59,9 +68,13 @@ class ConfigRedactionPolicy:
     def __post_init__(self) -> None:
         object.__setattr__(self, "_deny_exact_lower", {entry.lower() for entry in self.deny_exact})
         object.__setattr__(self, "_allow_exact_lower", {entry.lower() for entry in self.allow_exact})
-
-
-        object.__setattr__(self, "_deny_substrings_lower", tuple(fragment.lower() for fragment in self.deny_substrings))
+        # One alternation scans each key once instead of once per fragment.
+        fragments = [re.escape(fragment.lower()) for fragment in self.deny_substrings]
+        object.__setattr__(
+            self,
+            "_deny_substrings_re",
+            re.compile("|".join(fragments)) if fragments else None,
+        )
 
     def should_remove(self, key: str) -> bool:
         lowered = key.lower()
@@ -69,10 +82,10 @@ class ConfigRedactionPolicy:
             return False
         if lowered in self._deny_exact_lower:
             return True
-        for fragment in self._deny_substrings_lower:
-            if fragment in lowered:
-                return True
-        return False
+        return self._deny_substrings_re is not None and self._deny_substrings_re.search(lowered) is not None
+
+
+_DEFAULT_REDACTION_POLICY = ConfigRedactionPolicy()
 
 
 ######## CLI / Path / LLM Stat Helpers ########
@@ -132,21 +145,59 @@ def _copy_resource_tree(resource_root, destination: Path) -> None:
             target.mkdir(parents=True, exist_ok=True)
             for child in node.iterdir():
                 _copy(child, target / child.name)
+        elif isinstance(node, Path):
+            # Installed on disk: let the kernel copy the bytes.
+            shutil.copyfile(node, target)
         else:
-            target.parent.mkdir(parents=True, exist_ok=True)
             with node.open("rb") as src, open(target, "wb") as dst:
-                dst.write(src.read())
+                shutil.copyfileobj(src, dst, 1 << 20)
 
     destination_path = Path(destination)
     if destination_path.exists():
         shutil.rmtree(destination_path)
+    if isinstance(resource_root, Path):
+        # Installed on disk: copytree walks with os.scandir and reuses the
+        # cached DirEntry stats instead of stat'ing every node again.
+        shutil.copytree(resource_root, destination_path, copy_function=shutil.copyfile)
+        return
     destination_path.mkdir(parents=True, exist_ok=True)
     for child in resource_root.iterdir():
         _copy(child, destination_path / child.name)
 
+def _resource_tree_matches(resource_root, destination: Path) -> bool:
+    """Return True if ``destination`` already holds every file of the tree."""
+    for child in resource_root.iterdir():
+        target = destination / child.name
+        if child.is_dir():
+            if not target.is_dir() or not _resource_tree_matches(child, target):
+                return False
+        elif not _file_has_content(str(target), child.read_bytes()):
+            return False
+    return True
+
+
+def _last_build_mtime_ns(path: str, proj_name: str) -> int:
+    """Newest mtime of the fingerprint files Cargo compares sources against,
+    or 0 if the project was never built."""
+    pattern = os.path.join(
+        glob.escape(path), "target", "*", ".fingerprint", f"{glob.escape(proj_name)}-*", "*"
+    )
+    newest = 0
+    for fingerprint in glob.glob(pattern):
+        try:
+            newest = max(newest, os.stat(fingerprint).st_mtime_ns)
+        except OSError:
+            pass
+    return newest
+
+
 def create_rust_proj(rust_code, proj_name, path, is_lib: bool, proc_macro=False):
-    if os.path.exists(path):
-        shutil.rmtree(path)
+    # An existing project is updated in place rather than wiped, so Cargo's
+    # incremental cache under target/ survives and unchanged files keep
+    # their mtimes. Cargo only rebuilds sources newer than its last build,
+    # so a rewritten entry file is pushed past that point: otherwise, on a
+    # filesystem with coarse timestamps, a rewrite in the same tick as the
+    # previous build would be treated as fresh.
     os.makedirs(os.path.join(path, "src"), exist_ok=True)
 
     manifest = f'''
@@ -167,15 +218,24 @@ sactor_proc_macros = { path = "./sactor_proc_macros" }'''
 name = "{proj_name}"
 crate-type = ["cdylib"]'''
 
-    with open(f"{path}/Cargo.toml", "w") as f:
-        f.write(manifest)
-
-    if is_lib:
-        with open(f"{path}/src/lib.rs", "w") as f:
-            f.write(rust_code)
-    else:
-        with open(f"{path}/src/main.rs", "w") as f:
-            f.write(rust_code)
+    entry_point, stale_entry_point = (
+        ("src/lib.rs", "src/main.rs") if is_lib else ("src/main.rs", "src/lib.rs")
+    )
+    try:
+        os.remove(os.path.join(path, stale_entry_point))
+    except FileNotFoundError:
+        pass
+    for relpath, content in (("Cargo.toml", manifest), (entry_point, rust_code)):
+        file_path = os.path.join(path, relpath)
+        data = content.encode("utf-8")
+        if not _file_has_content(file_path, data):
+            atomic_write_bytes(file_path, data)
+            if relpath == entry_point:
+                last_build_ns = _last_build_mtime_ns(path, proj_name)
+                if last_build_ns and os.stat(file_path).st_mtime_ns <= last_build_ns:
+                    # Never in the future, or Cargo would keep rebuilding
+                    bumped_ns = max(time.time_ns(), last_build_ns + 1)
+                    os.utime(file_path, ns=(bumped_ns, bumped_ns))
 
     if proc_macro:
         macros_destination = Path(path) / "sactor_proc_macros"
@@ -183,7 +243,8 @@ crate-type = ["cdylib"]'''
         try:
             macros_resource = resources.files("sactor._resources").joinpath("sactor_proc_macros")
             if macros_resource.is_dir():
-                _copy_resource_tree(macros_resource, macros_destination)
+                if not _resource_tree_matches(macros_resource, macros_destination):
+                    _copy_resource_tree(macros_resource, macros_destination)
                 copied = True
         except Exception:
             logger.debug("Unable to copy proc macros from packaged resources", exc_info=True)
@@ -200,6 +261,40 @@ def get_temp_dir():
     return new_tmp_dir
 
 
+# Separators tolerated inside an LLM result tag such as ``----END ARG----``.
+# Newlines are excluded so a tag never spans multiple lines.
+_LLM_TAG_SEP = r"(?:[^\S\n]|[-_`])*"
+_LLM_TAG_STRIP_RE = re.compile(r"[\s\-_`]+")
+_LLM_FENCE_LINE_RE = re.compile(r"^[^\S\n]*(?:```|~~~).*(?:\n|\Z)", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _llm_tag_pattern(token: str) -> re.Pattern:
+    """Compile a pattern matching a whole line holding the canonical ``token``.
+
+    A tag line may contain the token letters in any case, separated by
+    whitespace, dashes, underscores or backticks, optionally followed by
+    ``:``/``.``.
+    """
+    letters = _LLM_TAG_SEP.join(
+        f"[{ch}{ch.lower()}]" if ch.isalpha() else re.escape(ch) for ch in token
+    )
+    return re.compile(
+        rf"^{_LLM_TAG_SEP}{letters}{_LLM_TAG_SEP}(?:[:.]+[^\S\n]*)?$",
+        re.MULTILINE,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _llm_arg_patterns(arg: str) -> Optional[tuple[re.Pattern, re.Pattern]]:
+    """Return the (start, end) tag patterns for ``arg``, or None if the
+    argument has no taggable characters."""
+    start_token = _LLM_TAG_STRIP_RE.sub("", arg.upper())
+    if not start_token:
+        return None
+    return _llm_tag_pattern(start_token), _llm_tag_pattern(f"END{start_token}")
+
+
 def parse_llm_result(llm_result, *args):
     '''
     Parse the result from LLM.
@@ -210,48 +305,23 @@ def parse_llm_result(llm_result, *args):
     ----END ARG----
     '''
 
-    def _canonical_tag(s: str) -> Optional[str]:
-        trimmed = s.strip()
-        if not trimmed:
-            return None
-        trimmed = trimmed.rstrip(":.")
-        if not trimmed:
-            return None
-        if not re.fullmatch(r"[A-Za-z0-9\s\-_`]+", trimmed):
-            return None
-        canonical = re.sub(r"[\s\-_`]+", "", trimmed)
-        return canonical.upper() or None
-
     res = {}
-    lines = llm_result.split("\n")
     for arg in args:
-        start_token = re.sub(r"[\s\-_`]+", "", arg.upper())
-        end_token = f"END{start_token}"
-        in_arg = False
-        start_found = False
-        arg_result = ""
-
-        for line in lines:
-            tag = _canonical_tag(line)
-            if not in_arg:
-                if tag == start_token:
-                    in_arg = True
-                    start_found = True
-                continue
-
-            if tag == end_token:
-                in_arg = False
-                break
-
-            stripped_line = line.strip()
-            if stripped_line.startswith("```") or stripped_line.startswith("~~~"):
-                continue
-            arg_result += line + "\n"
+        patterns = _llm_arg_patterns(arg)
+        if patterns is None:
+            raise ValueError(f"Could not find {arg}")
+        start_pattern, end_pattern = patterns
 
-        if not start_found:
+        start_match = start_pattern.search(llm_result)
+        if start_match is None:
             raise ValueError(f"Could not find {arg}")
-        if in_arg:
+        body_start = start_match.end() + 1
+        end_match = end_pattern.search(llm_result, body_start)
+        if end_match is None:
             raise ValueError(f"Could not find end of {arg}")
+
+        body = llm_result[body_start:end_match.start()]
+        arg_result = _LLM_FENCE_LINE_RE.sub("", body)
         if arg_result == "":
             raise ValueError(f"Empty result for {arg}")
         logger.debug("Generated %s:", arg)
@@ -260,59 +330,108 @@ def parse_llm_result(llm_result, *args):
     return res
 
 
-def save_code(path, code):
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a sibling temp file and ``os.replace``,
+    so readers never observe a partially written file."""
+    # Unique per thread too: shared caches are written from thread pools.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def save_code(path, code, format_now: bool = True) -> str:
+    """Write Rust ``code`` to ``path``, formatted with rustfmt, and return
+    the text that the file now holds.
+
+    Pass ``format_now=False`` when the caller formats many files at once
+    afterwards (e.g. ``cargo fmt`` over a whole crate), to avoid spawning
+    rustfmt per file.
+    """
     path_dir = os.path.dirname(path)
     os.makedirs(path_dir, exist_ok=True)
-    with open(path, "w") as f:
-        f.write(code)
-    rustfmt = RustFmt(path)
+    # Format in memory first so the file is written only once.
+    if format_now:
+        try:
+            code = _format_rust_code(code)
+        except Exception:
+            logger.warning("Cannot format the code")  # allow to continue
+    data = code.encode("utf-8")
+    if not _file_has_content(path, data):
+        atomic_write_bytes(path, data)
+    return code
+
+
+@functools.lru_cache(maxsize=128)
+def _format_rust_code(code: str) -> str:
+    # Translators often re-save identical snippets; reuse the rustfmt output.
+    return RustFmt.format_code(code)
+
+
+def _file_has_content(path: str, data: bytes) -> bool:
+    """Return True if ``path`` already holds exactly ``data``."""
     try:
-        rustfmt.format()
-    except Exception:
-        logger.warning("Cannot format the code")  # allow to continue
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
 
 
 def format_rust_snippet(code: str) -> str:
     """Return the rustfmt-formatted version of `code` when possible."""
 
+    # Format through rustfmt's stdin; no scratch file is needed.
     try:
-        with tempfile.TemporaryDirectory() as td:
-            path = os.path.join(td, "snippet.rs")
-            save_code(path, code)
-            with open(path, "r") as f:
-                return f.read().rstrip()
+        return _format_rust_code(code).rstrip()
     except Exception:
-        pass
-    return code
+        logger.warning("Cannot format the code")  # allow to continue
+    return code.rstrip()
 
 
-def _merge_configs(config, default_config):
-    config_out = {}
-
-    for key, default_value in default_config.items():
-        if key in config:
-            if isinstance(config[key], dict) and isinstance(default_value, dict):
-                config_out[key] = _merge_configs(config[key], default_value)
-            elif isinstance(config[key], dict) or isinstance(default_value, dict):
-                raise TypeError(f"Type mismatch for key '{key}': "
-                                f"config has {type(config[key])}, default_config has {type(default_value)}")
-            # Otherwise, config[key] takes precedence
-            else:
-                config_out[key] = config[key]
-        else:
-            config_out[key] = default_value
+_MISSING = object()
 
-    # Add keys that are only in config
+
+def _merge_configs(config, default_config):
+    # Start from the defaults and overlay the user config in one pass; keys
+    # only present in ``config`` end up after the defaults, as before.
+    config_out = dict(default_config)
     for key, value in config.items():
-        if key not in default_config:
+        default_value = default_config.get(key, _MISSING)
+        if default_value is _MISSING:
+            config_out[key] = value
+            continue
+        value_is_dict = isinstance(value, dict)
+        default_is_dict = isinstance(default_value, dict)
+        if value_is_dict and default_is_dict:
+            config_out[key] = _merge_configs(value, default_value)
+        elif value_is_dict or default_is_dict:
+            raise TypeError(f"Type mismatch for key '{key}': "
+                            f"config has {type(value)}, default_config has {type(default_value)}")
+        # Otherwise, config[key] takes precedence
+        else:
             config_out[key] = value
 
     return config_out
 
 
-def load_default_config():
-    """Load the bundled default configuration from packaged resources."""
-    resource_dir = Path(__file__).resolve().parent / "_resources"
+@functools.lru_cache(maxsize=1)
+def _package_dir() -> Path:
+    # The installed package never moves during a process; resolve it once.
+    return Path(__file__).resolve().parent
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_default_config() -> dict:
+    resource_dir = _package_dir() / "_resources"
     candidate = resource_dir / "sactor.default.toml"
     if candidate.is_file():
         with open(candidate, "rb") as f:
@@ -321,6 +440,25 @@ def load_default_config():
     raise FileNotFoundError("Could not load _resources/sactor.default.toml")
 
 
+def load_default_config():
+    """Load the bundled default configuration from packaged resources.
+
+    The file is parsed once per process; callers get their own copy so they
+    are free to mutate it.
+    """
+    return _copy_toml_value(_parse_default_config())
+
+
+def _copy_toml_value(value):
+    # TOML leaves are immutable scalars (str, int, float, bool, datetime), so
+    # only the dict/list containers need copying; much cheaper than deepcopy.
+    if isinstance(value, dict):
+        return {key: _copy_toml_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_toml_value(item) for item in value]
+    return value
+
+
 def load_spec_schema_text() -> str:
     """Return the spec schema JSON text from packaged resources.
 
@@ -333,7 +471,7 @@ def load_spec_schema_text() -> str:
     except Exception:
         pass
 
-    fallback = Path(__file__).resolve().parent / "verifier" / "spec" / "schema.json"
+    fallback = _package_dir() / "verifier" / "spec" / "schema.json"
     if fallback.is_file():
         return fallback.read_text(encoding="utf-8")
 
@@ -350,50 +488,55 @@ def try_load_config(config_file=None):
     4. `sactor.toml` inside the repository checkout (development mode).
     If none are found, return the default config alone.
     """
-    default_config = load_default_config()
-
-    def _load_user_config(path: Path) -> dict:
-        with open(path, "rb") as f:
-            return toml.load(f)
-
     if config_file:
         candidate = Path(config_file).expanduser()
         if not candidate.is_file():
             raise FileNotFoundError(f"Could not find config file {candidate}")
-        user_config = _load_user_config(candidate)
-        return _merge_configs(user_config, default_config)
+        return _load_merged_config(candidate)
 
     env_candidate = os.environ.get("SACTOR_CONFIG")
     if env_candidate:
         env_path = Path(env_candidate).expanduser()
         if not env_path.is_file():
             raise FileNotFoundError(f"SACTOR_CONFIG={env_candidate} does not point to a readable file")
-        user_config = _load_user_config(env_path)
-        return _merge_configs(user_config, default_config)
+        return _load_merged_config(env_path)
 
     cwd_candidate = Path.cwd() / "sactor.toml"
     if cwd_candidate.is_file():
-        user_config = _load_user_config(cwd_candidate)
-        return _merge_configs(user_config, default_config)
+        return _load_merged_config(cwd_candidate)
 
     # Load from repository root if in development mode
-    package_dir = Path(__file__).resolve().parent
+    package_dir = _package_dir()
     repo_candidate = package_dir.parent / "sactor.toml"
     if repo_candidate.is_file():
-        user_config = _load_user_config(repo_candidate)
-        return _merge_configs(user_config, default_config)
+        return _load_merged_config(repo_candidate)
 
     logger.info("No user config found; falling back to default configuration only")
-    return default_config
+    return load_default_config()
+
+
+def _load_merged_config(path: Path) -> dict:
+    # Keyed on the file's mtime and size so edits are picked up; callers get
+    # their own copy because they mutate the result.
+    st = path.stat()
+    merged = _merged_config_for(str(path.resolve()), st.st_mtime_ns, st.st_size)
+    return _copy_toml_value(merged)
+
+
+@functools.lru_cache(maxsize=8)
+def _merged_config_for(path: str, mtime_ns: int, size: int) -> dict:
+    with open(path, "rb") as f:
+        user_config = toml.load(f)
+    return _merge_configs(user_config, _parse_default_config())
 
 
 def normalize_string(output: str) -> str:
-    lines = output.splitlines()
-    for i, line in enumerate(lines):
-        lines[i] = line.strip()
-    return '\n'.join(lines)
+    return '\n'.join(map(str.strip, output.splitlines()))
 
 
+# Pure function of its (hashable) arguments; retries rename the same
+# signatures repeatedly, so skip the round trip into the Rust parser.
+@functools.lru_cache(maxsize=1024)
 def rename_rust_function_signature(signature: str, old_name: str, new_name: str, data_type: DataType) -> str:
     has_tail_comma = False
     if signature.strip().endswith(";"):
@@ -423,6 +566,38 @@ def rename_rust_function_signature(signature: str, old_name: str, new_name: str,
     return signature
 
 
+# The Rust parser entry points below are pure functions of the source text,
+# and translation/verification retries hand them the same code over and
+# over. Callers get fresh containers so the cached results stay intact.
+@functools.lru_cache(maxsize=512)
+def _cached_func_signatures(code: str) -> dict[str, str]:
+    return rust_ast_parser.get_func_signatures(code)
+
+
+def get_func_signatures(code: str) -> dict[str, str]:
+    return dict(_cached_func_signatures(code))
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_uses_code(code: str) -> tuple[str, ...]:
+    return tuple(rust_ast_parser.get_uses_code(code))
+
+
+def get_uses_code(code: str) -> list[str]:
+    return list(_cached_uses_code(code))
+
+
+@functools.lru_cache(maxsize=512)
+def count_unsafe_tokens(code: str) -> tuple[int, int]:
+    return rust_ast_parser.count_unsafe_tokens(code)
+
+
+@functools.lru_cache(maxsize=512)
+def rename_function(code: str, old_name: str, new_name: str) -> str:
+    return rust_ast_parser.rename_function(code, old_name, new_name)
+
+
+@functools.lru_cache(maxsize=1)
 def get_compiler() -> str:
     if shutil.which("clang"):
         compiler = "clang"
@@ -435,14 +610,68 @@ def get_compiler() -> str:
 
 
 def get_compiler_include_paths() -> list[str]:
-    compiler = get_compiler()
-    cmd = [compiler, '-v', '-E', '-x', 'c', '/dev/null']
+    # The system include paths do not change within a process, so the
+    # compiler is only probed once.
+    return list(_probe_compiler_include_paths(get_compiler()))
+
+
+def _include_paths_cache_file(compiler: str) -> Optional[str]:
+    """Return the on-disk cache file for ``compiler``'s include paths.
+
+    The key covers the resolved compiler binary, its mtime and the include
+    environment variables, so upgrading the compiler invalidates the entry.
+    The file lives in the per-user cache directory rather than the shared
+    temp dir, where another user could plant extra include paths.
+    """
+    compiler_path = shutil.which(compiler)
+    if compiler_path is None:
+        return None
+    compiler_path = os.path.realpath(compiler_path)
+    try:
+        mtime_ns = os.stat(compiler_path).st_mtime_ns
+    except OSError:
+        return None
+    key = "\0".join(
+        [compiler_path, str(mtime_ns)]
+        + [os.environ.get(var, "") for var in ("CPATH", "C_INCLUDE_PATH")]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "sactor", f"include_paths_{digest}.json")
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_compiler_include_paths(compiler: str) -> tuple[str, ...]:
+    cache_file = _include_paths_cache_file(compiler)
+    if cache_file is not None:
+        try:
+            with open(cache_file, "rb") as f:
+                cached = json.load(f)
+            if isinstance(cached, list) and all(isinstance(p, str) for p in cached):
+                return tuple(cached)
+        except (OSError, ValueError):
+            pass
+
+    search_include_paths = _run_include_path_probe(compiler)
+    if cache_file is not None and search_include_paths:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            atomic_write_bytes(cache_file, json.dumps(search_include_paths).encode("utf-8"))
+        except OSError:
+            logger.debug("Unable to cache compiler include paths", exc_info=True)
+    return search_include_paths
+
+
+def _run_include_path_probe(compiler: str) -> tuple[str, ...]:
+    # The search list is printed on stderr; discard the preprocessed output.
+    cmd = [compiler, '-v', '-E', '-x', 'c', '/dev/null', '-o', '/dev/null']
     result = run_command(cmd)
-    compile_output = result.stderr
     search_include_paths = []
 
     add_include_path = False
-    for line in compile_output.split('\n'):
+    for line in result.stderr.splitlines():
         if line.startswith('#include <...> search starts here:'):
             add_include_path = True
             continue
@@ -452,19 +681,21 @@ def get_compiler_include_paths() -> list[str]:
         if add_include_path:
             search_include_paths.append(line.strip())
 
-    return search_include_paths
+    return tuple(search_include_paths)
+
+
+# "gcc" contains "cc", so matching "cc" or "clang" covers all three names.
+_COMPILER_NAME_RE = re.compile(r"cc|clang", re.IGNORECASE)
+
 
 def is_compile_command(command: List[str]) -> bool:
     """Return True if the command invokes a C compiler (gcc/clang/cc variants)."""
     if not command:
         return False
-    compilers = ("gcc", "clang", "cc")
     for token in command:
         if not isinstance(token, str):
             continue
-        name = os.path.basename(token)
-        lower = name.lower()
-        if any(comp in lower for comp in compilers):
+        if _COMPILER_NAME_RE.search(os.path.basename(token)):
             return True
     return False
 
@@ -582,48 +813,74 @@ def list_c_files_from_compile_commands(path: str) -> list[str]:
         files.append(filename_abs)
     return files
 
+# Printable ASCII without quotes or backslashes: shlex.split would only split
+# such a line on whitespace, which str.split does much faster.
+_PLAIN_COMMAND_RE = re.compile(r"[ \t!#-&(-\[\]-~]*")
+
+
 def process_commands_to_list(commands: str, to_translate_file: str) -> List[List[str]]:
     result: list[list[str]] = []
-    target_abs = os.path.realpath(to_translate_file)
+    try:
+        target_stat = os.stat(to_translate_file)
+        target_id = (target_stat.st_dev, target_stat.st_ino)
+    except FileNotFoundError:
+        target_id = None
+    # Same semantics as os.path.samefile, but the target is stat'ed once and
+    # each distinct source path at most once.
+    is_target_cache: dict[str, bool] = {}
+
+    def _is_target(item: str) -> bool:
+        cached = is_target_cache.get(item)
+        if cached is None:
+            try:
+                st = os.stat(item)
+                cached = (st.st_dev, st.st_ino) == target_id
+            except FileNotFoundError:
+                cached = False
+            is_target_cache[item] = cached
+        return cached
+
     for line in commands.splitlines():
         line = line.strip()
         if not line:
             continue
-        command = shlex.split(line)
+        if _PLAIN_COMMAND_RE.fullmatch(line):
+            command = line.split()
+        else:
+            command = shlex.split(line)
         replaced_target = False
-        for i, item in enumerate(command[:]):
-            if item.endswith(".c"):
-                try:
-                    if os.path.samefile(item, target_abs):
-                        command[i] = TO_TRANSLATE_C_FILE_MARKER
-                        replaced_target = True
-                        continue
-                except FileNotFoundError:
-                    pass
+        if target_id is not None:
+            for i, item in enumerate(command):
+                if item.endswith(".c") and _is_target(item):
+                    command[i] = TO_TRANSLATE_C_FILE_MARKER
+                    replaced_target = True
         if replaced_target:
             command.extend(("-Og", "-g"))
         result.append(command)
     return result
 
 
+def _clone_commands(commands: List[List[str]]) -> List[List[str]]:
+    # Tokens are immutable strings, so copying the outer lists is enough.
+    return [list(command) for command in commands]
+
+
 def process_commands_to_compile(commands: List[List[str]], output_path: str, source_path: str | list[str]) -> List[List[str]]:
-    commands = copy.deepcopy(commands)
-    for i, command in enumerate(commands[:]):
+    commands = _clone_commands(commands)
+    source_is_list = isinstance(source_path, list)
+    for i, command in enumerate(commands):
         if is_compile_command(command):
-            replaced_marker = False
-            for j, item in enumerate(command[:]):
-                if item == TO_TRANSLATE_C_FILE_MARKER:
-                    command[j] = source_path
-                    replaced_marker = True
-            if replaced_marker:
-                if isinstance(source_path, list):
-                    flatten_command = []
-                    for token in command:
-                        if isinstance(token, list):
-                            flatten_command.extend(token)
-                        else:
-                            flatten_command.append(token)
-                    command = flatten_command
+            if TO_TRANSLATE_C_FILE_MARKER in command:
+                # Substitute (and flatten) the source path in a single pass.
+                expanded = []
+                for item in command:
+                    if item != TO_TRANSLATE_C_FILE_MARKER:
+                        expanded.append(item)
+                    elif source_is_list:
+                        expanded.extend(source_path)
+                    else:
+                        expanded.append(source_path)
+                command = expanded
                 if "-c" not in command:
                     command.append("-c")
                 try:
@@ -639,11 +896,87 @@ def process_commands_to_compile(commands: List[List[str]], output_path: str, sou
     return commands
 
 
+_parallel_worker = threading.local()
+
+
+def _mark_parallel_worker() -> None:
+    _parallel_worker.active = True
+
+
+def parallel_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool for independent external commands.
+
+    Work submitted from one of its workers sees ``parallel_jobs() == 1``, so
+    nested pools share a single job budget instead of multiplying it.
+    """
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=_mark_parallel_worker)
+
+
+def parallel_jobs(config: dict) -> int:
+    """Number of independent external commands sactor may run concurrently.
+
+    Controlled by ``general.jobs``: ``1`` (the default) means sequential,
+    ``0`` means one job per CPU. Always 1 inside a parallel_executor worker.
+    """
+    if getattr(_parallel_worker, "active", False):
+        return 1
+    raw = config.get('general', {}).get('jobs', 1)
+    try:
+        jobs = int(raw)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid general.jobs=%r", raw)
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _compile_output(command: List[str]) -> Optional[str]:
+    """Return the ``-o`` target of a compile-only (``-c``) command, else None."""
+    if "-c" not in command or not is_compile_command(command):
+        return None
+    try:
+        out_idx = command.index("-o")
+    except ValueError:
+        return None
+    if out_idx + 1 >= len(command):
+        return None
+    return command[out_idx + 1]
+
+
+def _independent_compile_batches(commands: List[List[str]]) -> List[List[List[str]]]:
+    """Group ``commands`` into batches that preserve the original ordering.
+
+    Consecutive compile-only commands writing distinct objects share a batch
+    and may run concurrently; every other command is a batch of its own.
+    """
+    batches: List[List[List[str]]] = []
+    current: List[List[str]] = []
+    outputs: set[str] = set()
+    for command in commands:
+        output = _compile_output(command)
+        if output is not None and output not in outputs:
+            current.append(command)
+            outputs.add(output)
+            continue
+        if current:
+            batches.append(current)
+            current, outputs = [], set()
+        if output is not None:
+            current, outputs = [command], {output}
+        else:
+            batches.append([command])
+    if current:
+        batches.append(current)
+    return batches
+
+
 def compile_c_code(
     file_path: str,
     commands: list[list[str]],
     link_args: Optional[Sequence[str]] = None,
     is_library: bool = False,
+    jobs: int = 1,
 ) -> str:
     '''
     Compile a C file to a executable file, return the path to the executable
@@ -651,6 +984,7 @@ def compile_c_code(
     commands: compilation command for a C file. If it requires multiple commands sequentially, separate the commands by newlines.
     The last command if it contains (`gcc` or `clang`) and `-o [path]`, [path] will be replaced by `executable_path` as defined in the function.
     All gcc or libtool will be added -Og -g flags.
+    jobs: how many independent compile steps may run concurrently (see parallel_jobs).
     '''
     compiler = get_compiler()
     tmpdir = os.path.join(get_temp_dir(), "c_compile")
@@ -662,12 +996,23 @@ def compile_c_code(
     processed_commands = process_commands_to_compile(commands, object_path, file_path)
     if processed_commands:
         for command in processed_commands:
-            to_check = False
-            if is_compile_command(command):
-                to_check = True
-                if "-ftrapv" not in command:
-                    command.append("-ftrapv")
-            run_command(command, capture_output=False, check=to_check)
+            if is_compile_command(command) and "-ftrapv" not in command:
+                command.append("-ftrapv")
+        if jobs > 1:
+            batches = _independent_compile_batches(processed_commands)
+        else:
+            batches = [[command] for command in processed_commands]
+        for batch in batches:
+            if len(batch) == 1:
+                command = batch[0]
+                run_command(command, capture_output=False, check=is_compile_command(command))
+                continue
+            with parallel_executor(min(jobs, len(batch))) as executor:
+                # Consume the iterator so the first failure is re-raised here.
+                list(executor.map(
+                    lambda command: run_command(command, capture_output=False, check=True),
+                    batch,
+                ))
         if not is_library:
             link_cmd = [
                 compiler,
@@ -702,11 +1047,13 @@ def compile_c_code(
 def cursor_get_tokens(cursor: Cursor):
     tu = cursor.translation_unit
 
-    start = cursor.extent.start
+    # Fetch the extent once; each property access is a libclang call.
+    extent = cursor.extent
+    start = extent.start
     start = SourceLocation.from_position(
         tu, start.file, start.line, start.column)
 
-    end = cursor.extent.end
+    end = extent.end
     end = SourceLocation.from_position(tu, end.file, end.line, end.column)
 
     extent = SourceRange.from_locations(start, end)
@@ -716,11 +1063,17 @@ def cursor_get_tokens(cursor: Cursor):
 def try_backup_file(file_path):
     if not os.path.exists(file_path):
         return
-    backup_path = file_path + ".bak"
+    # List the directory once instead of stat'ing every candidate slot.
+    directory, base = os.path.split(file_path)
+    prefix = base + ".bak"
+    with os.scandir(directory or ".") as entries:
+        taken = {entry.name for entry in entries if entry.name.startswith(prefix)}
+    backup_name = prefix
     number = 1
-    while os.path.exists(backup_path):
-        backup_path = file_path + f".bak.{number}"
+    while backup_name in taken:
+        backup_name = f"{prefix}.{number}"
         number += 1
+    backup_path = os.path.join(directory, backup_name)
 
     os.rename(file_path, backup_path)
 
@@ -735,14 +1088,19 @@ def load_text_with_mappings(path: str, encoding: str = 'utf-8'):
     Returns a tuple (text_str, data_bytes, b2s, s2b) where:
     - text_str: the file decoded as a Python string using the given encoding
     - data_bytes: the raw file content in bytes
-    - b2s: list mapping byte offset -> string index (codepoint index)
-    - s2b: list mapping string index -> byte offset
+    - b2s: sequence mapping byte offset -> string index (codepoint index)
+    - s2b: sequence mapping string index -> byte offset
+    For pure-ASCII UTF-8 input both are a ``range`` (the identity mapping).
     """
     with open(path, 'rb') as f:
         data_bytes = f.read()
     text_str = data_bytes.decode(encoding, errors='strict')
     b_len = len(data_bytes)
     s_len = len(text_str)
+    if codecs.lookup(encoding).name == 'utf-8':
+        b2s, s2b = _utf8_offset_mappings(data_bytes, s_len)
+        return text_str, data_bytes, b2s, s2b
+
     b2s = [0] * (b_len + 1)
     s2b = [0] * (s_len + 1)
     byte_pos = 0
@@ -758,7 +1116,33 @@ def load_text_with_mappings(path: str, encoding: str = 'utf-8'):
     return text_str, data_bytes, b2s, s2b
 
 
-def byte_to_str_index(b2s: list[int], b_off: int) -> int:
+# Maps every byte to 1 if it starts a UTF-8 sequence, 0 for continuation bytes.
+_UTF8_LEAD_BYTE_TABLE = bytes(0 if 0x80 <= b < 0xC0 else 1 for b in range(256))
+
+
+def _utf8_offset_mappings(
+    data_bytes: bytes, s_len: int
+) -> tuple[Sequence[int], Sequence[int]]:
+    """Build the b2s/s2b tables of valid UTF-8 ``data_bytes`` without a
+    per-codepoint Python loop."""
+    b_len = len(data_bytes)
+    if b_len == s_len:
+        # Pure ASCII: byte offsets and string indices coincide, so an O(1)
+        # range stands in for the identity table.
+        identity = range(b_len + 1)
+        return identity, identity
+    is_lead = data_bytes.translate(_UTF8_LEAD_BYTE_TABLE)
+    # Every byte maps to the index of the codepoint it belongs to, i.e. the
+    # number of lead bytes seen so far minus one. The first byte of valid
+    # UTF-8 is always a lead byte, so it is folded into the initial value.
+    b2s = list(itertools.accumulate(is_lead[1:], initial=0))
+    b2s.append(s_len)
+    s2b = list(itertools.compress(range(b_len), is_lead))
+    s2b.append(b_len)
+    return b2s, s2b
+
+
+def byte_to_str_index(b2s: Sequence[int], b_off: int) -> int:
     """
     Convert a byte offset (from libclang extents) to a Python string index
     using a precomputed byte->string mapping.
@@ -770,6 +1154,15 @@ def byte_to_str_index(b2s: list[int], b_off: int) -> int:
     return b2s[b_off]
 
 
+def byte_to_str_indices(b2s: Sequence[int], offsets: Iterable[int]) -> list[int]:
+    """
+    Batch form of `byte_to_str_index`: convert many byte offsets at once,
+    clamping each one into the range covered by ``b2s``.
+    """
+    last = len(b2s) - 1
+    return [b2s[min(max(off, 0), last)] for off in offsets]
+
+
 def scan_ws_semicolon_bytes(data: bytes, pos: int) -> int:
     """
     From a byte position, skip ASCII whitespace and one optional semicolon.
@@ -783,47 +1176,66 @@ def scan_ws_semicolon_bytes(data: bytes, pos: int) -> int:
         pos += 1
     return pos
 
+_TEST_DEFINE_RE = re.compile(r"-D\w*?TEST")
+
+
 def get_compile_flags_from_commands(processed_compile_commands: List[List[str]]) -> list[str]:
     """To get only the compile flags, for the C source file. If they have specific linking flags, this function does not care."""
-    processed_commands = copy.deepcopy(processed_compile_commands)
-    cmd = []
     # assume the first command mentioning the to-be-translated C source is the command containing the flags.
     # TODO: This code assumes that the first such command is either a compile command or a compile-and-linking command. Add checks to test
     #       if it is.
-    for cmd2 in processed_commands:
-        if TO_TRANSLATE_C_FILE_MARKER in cmd2:
-            cmd = cmd2
-            break
-    processed_commands = cmd
-    flags =  list(filter(lambda s: s.startswith("-"), processed_commands))
-    # flags for macro-expanding C source files with tests
-    del_index = []
-    for i, flag in enumerate(flags):
-        if flag == "-o" or flag == '-c' or flag.startswith("-M"):
-            del_index.append(i)
-    for i in del_index[::-1]:
-        del flags[i]
-    # flags for macro-expanding C source files without tests. We remove test flags if they are wrongly included by the input.
-    del_index = []
-    for i, flag in enumerate(flags):
-        if re.search(r"-D[\w\d_]*?TEST", flag) :
-            del_index.append(i)
-    for i in del_index[::-1]:
-        del flags[i]
-    flags_without_tests = flags
+    cmd = next(
+        (cmd2 for cmd2 in processed_compile_commands if TO_TRANSLATE_C_FILE_MARKER in cmd2),
+        [],
+    )
+    # Keep only flags, dropping output/compile-only/dependency flags (-o, -c, -M*)
+    # and test macros that may have been wrongly included by the input.
+    flags_without_tests = [
+        flag for flag in cmd
+        if flag.startswith("-")
+        and flag != "-o"
+        and flag != "-c"
+        and not flag.startswith("-M")
+        and not _TEST_DEFINE_RE.search(flag)
+    ]
     return flags_without_tests
 
+# Files modified more recently than this are never served from the cache:
+# filesystem timestamps are coarse, so a quick rewrite of the same size could
+# otherwise go unnoticed.
+_READ_CACHE_MIN_AGE_NS = 2_000_000_000
+
+
 def read_file(path: str) -> str:
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Could not find file {path}")
-    with open(path, "r") as f:
-        return f.read()
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Could not find file {path}") from None
+    if time.time_ns() - st.st_mtime_ns < _READ_CACHE_MIN_AGE_NS:
+        return _read_text(path)
+    return _read_text_cached(path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_text_cached(path: str, ino: int, mtime_ns: int, size: int) -> str:
+    return _read_text(path)
+
+
+def _read_text(path: str) -> str:
+    # Read the raw bytes in one go and decode once instead of going through
+    # TextIOWrapper; newlines are normalised the way text mode would.
+    text = Path(path).read_bytes().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 def read_file_lines(path: str) -> List[str]:
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Could not find file {path}")
-    with open(path, "r") as f:
-        return f.readlines()
+    # Same result as readlines() in text mode: split on "\n" only, keeping it.
+    lines = read_file(path).split("\n")
+    result = [line + "\n" for line in lines[:-1]]
+    if lines[-1]:
+        result.append(lines[-1])
+    return result
 
 def patched_env(key, value, env=None):
     if env is None:
@@ -848,7 +1260,7 @@ def sanitize_config(
     replaced with a redaction token.
     """
 
-    active_policy = policy or ConfigRedactionPolicy()
+    active_policy = policy or _DEFAULT_REDACTION_POLICY
 
     if isinstance(obj, dict):
         cleaned: dict = {}
@@ -883,6 +1295,76 @@ def _extend_with_limit(buffer: bytearray, chunk: bytes, limit: int) -> bool:
     return len(chunk) > remaining
 
 
+def _time_limit_error(time_limit_sec: float | None) -> TimeoutError:
+    return TimeoutError(
+        "Time limit exceeded while running command"
+        if time_limit_sec is None
+        else f"Time limit ({time_limit_sec:.2f}s) exceeded while running command"
+    )
+
+
+def _make_process_result(
+    stdout_bytes: bytes,
+    stderr_bytes: bytes,
+    returncode: int | None,
+    text: bool,
+) -> ProcessResult:
+    if returncode is None:
+        returncode = 0
+    if text:
+        return ProcessResult(
+            stdout_bytes.decode(errors="ignore"),
+            stderr_bytes.decode(errors="ignore"),
+            returncode,
+        )
+    return ProcessResult(stdout_bytes, stderr_bytes, returncode)
+
+
+_TERMINATE_GRACE_SEC = 5
+# Matches the default pipe capacity on Linux, so one read usually empties it.
+_PIPE_READ_SIZE = 65536
+
+
+def _join_all(threads: list[threading.Thread], timeout: float) -> bool:
+    """Join ``threads`` within a shared ``timeout``; return True if all finished."""
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return not any(thread.is_alive() for thread in threads)
+
+
+def _pump_stream(
+    stream,
+    buffer: bytearray,
+    limit: int,
+    name: str,
+    on_limit,
+) -> None:
+    """Read ``stream`` until EOF, keeping at most ``limit`` bytes in ``buffer``.
+
+    ``on_limit(name)`` is called once when the limit is first exceeded; the
+    rest of the output is drained and discarded so the child never blocks on
+    a full pipe. The stream is closed on return.
+    """
+
+    fd = stream.fileno()
+    limit_reported = False
+    try:
+        while True:
+            chunk = os.read(fd, _PIPE_READ_SIZE)
+            if not chunk:
+                return
+            if limit_reported:
+                continue
+            if _extend_with_limit(buffer, chunk, limit):
+                limit_reported = True
+                on_limit(name)
+    finally:
+        # The pump owns the stream: closing it from another thread while a
+        # read is pending would let the fd number be reused underneath us.
+        stream.close()
+
+
 def _run_command_streaming(
     cmd: Sequence[str | os.PathLike[str]],
     *,
@@ -908,100 +1390,70 @@ def _run_command_streaming(
 
     stdout_buf = bytearray()
     stderr_buf = bytearray()
-    timed_out = False
-    start_time = time.monotonic()
-    streams = []
-    if process.stdout is not None:
-        streams.append(process.stdout)
-    if process.stderr is not None:
-        streams.append(process.stderr)
-
-    while streams:
-        now = time.monotonic()
-        if time_limit_sec is not None and now - start_time >= time_limit_sec:
-            timed_out = True
+    terminate_lock = threading.Lock()
+
+    def _on_limit(name: str) -> None:
+        with terminate_lock:
             logger.warning(
-                "Time limit reached (%.2fs); terminating process",
-                configured_time_limit,
+                "%s byte limit reached (%d bytes); terminating process",
+                name,
+                limit_bytes,
             )
-            process.terminate()
-            time_limit_sec = None  # avoid repeated termination attempts
-
-        timeout = None
-        if time_limit_sec is not None:
-            timeout = max(0.0, min(0.2, time_limit_sec - (now - start_time)))
-
-        readable, _, _ = select.select(streams, [], [], timeout)
-        if not readable:
-            if process.poll() is not None:
-                # Drain any remaining data after process exit.
-                for stream in list(streams):
-                    chunk = stream.read()
-                    if chunk:
-                        truncated = _extend_with_limit(
-                            stdout_buf if stream is process.stdout else stderr_buf,
-                            chunk,
-                            limit_bytes,
-                        )
-                        if truncated:
-                            logger.warning(
-                                "%s byte limit reached (%d bytes); terminating process",
-                                "Stdout" if stream is process.stdout else "Stderr",
-                                limit_bytes,
-                            )
-                            if process.poll() is None:
-                                process.terminate()
-                    else:
-                        streams.remove(stream)
-            continue
+            if process.poll() is None:
+                process.terminate()
+
+    # Drain both pipes concurrently; os.read releases the GIL so neither
+    # stream can stall the other.
+    pumps = [
+        threading.Thread(
+            target=_pump_stream,
+            args=(stream, buffer, limit_bytes, name, _on_limit),
+            daemon=True,
+        )
+        for stream, buffer, name in (
+            (process.stdout, stdout_buf, "Stdout"),
+            (process.stderr, stderr_buf, "Stderr"),
+        )
+        if stream is not None
+    ]
+    for pump in pumps:
+        pump.start()
 
-        for stream in readable:
-            chunk = stream.read(4096)
-            if not chunk:
-                streams.remove(stream)
-                continue
-            buffer = stdout_buf if stream is process.stdout else stderr_buf
-            truncated = _extend_with_limit(buffer, chunk, limit_bytes)
-            if truncated:
-                logger.warning(
-                    "%s byte limit reached (%d bytes); terminating process",
-                    "Stdout" if stream is process.stdout else "Stderr",
-                    limit_bytes,
-                )
-                if process.poll() is None:
-                    process.terminate()
-
-        if process.poll() is not None:
-            # Allow loop to drain remaining buffered data on next iteration.
-            continue
+    timed_out = False
+    if time_limit_sec is None:
+        for pump in pumps:
+            pump.join()
+    else:
+        _join_all(pumps, time_limit_sec)
+    if any(pump.is_alive() for pump in pumps):
+        timed_out = True
+        logger.warning(
+            "Time limit reached (%.2fs); terminating process",
+            configured_time_limit,
+        )
+        with terminate_lock:
+            process.terminate()
+        # Never block indefinitely on the pumps: a child ignoring SIGTERM is
+        # killed after a grace period, and pipes kept open by grandchildren
+        # are abandoned to the daemon threads.
+        if not _join_all(pumps, _TERMINATE_GRACE_SEC):
+            process.kill()
+            _join_all(pumps, _TERMINATE_GRACE_SEC)
 
     try:
-        process.wait(timeout=5)
+        process.wait(timeout=_TERMINATE_GRACE_SEC)
     except subprocess.TimeoutExpired:
         process.kill()
-    finally:
-        if process.stdout is not None:
-            process.stdout.close()
-        if process.stderr is not None:
-            process.stderr.close()
 
     returncode = process.poll()
     if timed_out:
-        raise TimeoutError(
-            "Time limit exceeded while running command"
-            if configured_time_limit is None
-            else f"Time limit ({configured_time_limit:.2f}s) exceeded while running command"
-        )
+        raise _time_limit_error(configured_time_limit)
 
-    stdout_bytes = bytes(stdout_buf[:limit_bytes])
-    stderr_bytes = bytes(stderr_buf[:limit_bytes])
-    if text:
-        return ProcessResult(
-            stdout_bytes.decode(errors="ignore"),
-            stderr_bytes.decode(errors="ignore"),
-            returncode if returncode is not None else 0,
-        )
-    return ProcessResult(stdout_bytes, stderr_bytes, returncode if returncode is not None else 0)
+    # _extend_with_limit never grows the buffers past limit_bytes, so they can
+    # be copied out whole without an intermediate slice.
+    stdout_bytes = bytes(stdout_buf)
+    stderr_bytes = bytes(stderr_buf)
+    return _make_process_result(stdout_bytes, stderr_bytes, returncode, text)
 
 def run_command(
     cmd: Sequence[str | os.PathLike[str]],
@@ -1,6 +1,6 @@
 import os
 import json as json
-from typing import Optional, override
+from typing import NamedTuple, Optional, override
 
 from sactor import logging as sactor_logging, rust_ast_parser, utils
 from sactor.c_parser import FunctionInfo, StructInfo
@@ -15,6 +15,51 @@ from sactor.verifier.spec.harness_codegen import generate_struct_harness_from_sp
 logger = sactor_logging.get_logger(__name__)
 
 
+_FUNCTION_END_TAG = "----END FUNCTION----"
+
+_HARNESS_PROMPT_OUTPUT_FORMAT = '''
+Output the translated function into this format (wrap with the following tags):
+----FUNCTION----
+```rust
+// Your translated function here
+```
+----END FUNCTION----
+'''
+
+# Failure-specific wording of the feedback block appended on retries
+_HARNESS_FEEDBACK_TEXT = {
+    VerifyResult.COMPILE_ERROR: (
+        "It failed to compile with the following error message:",
+        "Analyzing the error messages, think about the possible reasons, and try to avoid this error.",
+    ),
+    VerifyResult.TEST_ERROR: (
+        "It failed the following tests:",
+        "Analyze the error messages, think about the possible reasons, and try to avoid this error.",
+    ),
+    VerifyResult.TEST_TIMEOUT: (
+        "It failed the following tests:",
+        "Analyze the error messages, think about the possible reasons, and try to avoid this error.",
+    ),
+}
+
+
+class _FunctionHarnessSetup(NamedTuple):
+    """Attempt-independent inputs of a function harness request."""
+    original_signature_renamed: str
+    idiom_decl_name: str
+    idiomatic_signature_replaced: str
+    struct_idiomatic_name_map: dict[str, str]
+    func_spec_path: str
+    spec_hints_text: Optional[str]
+    prompt: str
+
+
+class _HarnessRetry(NamedTuple):
+    """Failed harness attempt, carrying the feedback for the next one."""
+    verify_result: tuple[VerifyResult, Optional[str]]
+    error_translation: Optional[str]
+
+
 class IdiomaticVerifier(Verifier):
     def __init__(
         self,
@@ -50,6 +95,9 @@ class IdiomaticVerifier(Verifier):
             self.build_path, "function_test_harness")
         self.struct_test_harness_dir = os.path.join(
             self.build_path, "struct_test_harness")
+        # Function harnesses just written to function_test_harness_dir,
+        # handed to verify_function without reading the file back.
+        self._function_harness_code: dict[str, str] = {}
         self.llm = llm
         self.max_attempts = self.config['general']['max_verifier_harness_attempts']
         if result_path is not None:
@@ -198,8 +246,7 @@ class IdiomaticVerifier(Verifier):
             self.struct_test_harness_dir, f"{struct_name}.rs")
         if not os.path.exists(harness_path):
             return
-        with open(harness_path) as f:
-            harness_code = f.read()
+        harness_code = utils.read_file(harness_path)
         utils.save_code(
             os.path.join(
                 self.saved_test_harness_path, "structs", f"{struct_name}.rs"
@@ -267,27 +314,72 @@ class IdiomaticVerifier(Verifier):
         error_translation=None,
         attempts=0,
     ):
-        if attempts > self.max_attempts - 1:
-            logger.error(
-                "Failed to get compilable test harness for function %s after %d attempts",
+        # Retry iteratively so that a failed attempt's prompt and code are
+        # released before the next one instead of piling up on the stack.
+        setup = None
+        while attempts <= self.max_attempts - 1:
+            if setup is None:
+                setup = self._function_harness_setup(
+                    function_name,
+                    idiomatic_impl,
+                    original_signature,
+                    idiomatic_signature,
+                    struct_signature_dependency_names,
+                )
+            outcome = self._function_harness_attempt(
                 function_name,
-                self.max_attempts,
-            )
-            last_status, last_log = verify_result
-            detail = ""
-            if last_status != VerifyResult.SUCCESS and last_log:
-                detail = f"\nLast error ({last_status.name}):\n{last_log}"
-            message = (
-                f"Spec-driven harness exhausted {self.max_attempts} attempts for function {function_name}."
+                idiomatic_impl,
+                struct_signature_dependency_names,
+                setup,
+                verify_result,
+                error_translation,
+                attempts,
             )
-            message += detail
-            return (VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED, message)
-        logger.info(
-            "Generating test harness for function %s (attempt %d)",
+            if not isinstance(outcome, _HarnessRetry):
+                return outcome
+            verify_result, error_translation = outcome
+            del outcome
+            attempts += 1
+
+        logger.error(
+            "Failed to get compilable test harness for function %s after %d attempts",
             function_name,
-            attempts,
+            self.max_attempts,
         )
-
+        last_status, last_log = verify_result
+        detail = ""
+        if last_status != VerifyResult.SUCCESS and last_log:
+            detail = f"\nLast error ({last_status.name}):\n{last_log}"
+        message = (
+            f"Spec-driven harness exhausted {self.max_attempts} attempts for function {function_name}."
+        )
+        message += detail
+        return (VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED, message)
+
+    def _query_function_block(self, prompt: str, use_cache: bool = True) -> str:
+        """Query the LLM for a single ----FUNCTION---- block, stopping the
+        generation at its end tag instead of paying for trailing output."""
+        response = self.llm.query(prompt, stop=[_FUNCTION_END_TAG], use_cache=use_cache)
+        # The stop sequence itself is not part of the returned text. Only put
+        # it back when the generation ended there; a reply cut off by the
+        # token limit must still fail to parse.
+        if (
+            _FUNCTION_END_TAG not in response
+            and getattr(self.llm, "last_finish_reason", None) == "stop"
+        ):
+            response = f"{response.rstrip()}\n{_FUNCTION_END_TAG}\n"
+        return response
+
+    def _function_harness_setup(
+        self,
+        function_name,
+        idiomatic_impl,
+        original_signature,
+        idiomatic_signature,
+        struct_signature_dependency_names: list[str],
+    ) -> _FunctionHarnessSetup:
+        """Compute everything about a function harness request that does not
+        change between attempts, including the static part of the prompt."""
         original_signature_renamed = original_signature
         if len(struct_signature_dependency_names) > 0:
             # rename oringal signature to use unidiomatic struct
@@ -299,16 +391,16 @@ class IdiomaticVerifier(Verifier):
                     DataType.STRUCT
                 )
 
-        uses = rust_ast_parser.get_uses_code(idiomatic_impl)
+        uses = utils.get_uses_code(idiomatic_impl)
         joint_uses = '\n'.join(uses)
         # Rename idiomatic signature function name to `{function_name}_idiomatic` even if the
         # idiomatic translation changed the name. Use Rust AST parser to get function names.
         try:
-            sig_map = rust_ast_parser.get_func_signatures(idiomatic_signature)
+            sig_map = utils.get_func_signatures(idiomatic_signature)
             if len(sig_map) >= 1:
                 idiom_decl_name = next(iter(sig_map.keys()))
             else:
-                impl_map = rust_ast_parser.get_func_signatures(idiomatic_impl)
+                impl_map = utils.get_func_signatures(idiomatic_impl)
                 idiom_decl_name = next(iter(impl_map.keys())) if len(impl_map) >= 1 else function_name
         except Exception:
             idiom_decl_name = function_name
@@ -326,7 +418,7 @@ class IdiomaticVerifier(Verifier):
 
         if struct_signature_dependency_names:
             convert_back_prompt = "You need to covert mutable reference back and **COPY** the content of C structs to the input mutable pointers, as all convertion functions are at **DIFFERENT** memory locations"
-        prompt = f'''
+        prompt_parts = [f'''
 This is the idiomatic Rust implementation (translated from the unidiomatic Rust), the function signature is
 ```rust
 {idiomatic_signature_replaced};
@@ -350,67 +442,33 @@ You should **NOT** add any dummy implementation of the function or structs, as i
 }}
 ```
 remove all the TODOs and replace them with the necessary code.
-'''
+''']
         if len(struct_signature_dependency_names) > 0:
-            prompt += f'''
+            prompt_parts.append(f'''
 Some structs are used in the function invoking, in {function_name}, they are invoked C structs, and in the {function_name}_idiomatic, they are idiomatic structs, you should call the following functions to convert between the two structs
 They will be provided by the verifier, **DO NOT** implement or add template code for them:
 ```rust
-'''
+''')
             for struct_name in struct_signature_dependency_names:
                 idiom_name = struct_idiomatic_name_map.get(struct_name, struct_name)
-                prompt += f'''
+                prompt_parts.append(f'''
 // {idiom_name} <-> C{struct_name}
 unsafe fn {idiom_name}_to_C{struct_name}_mut(input: &mut {idiom_name}) -> *mut C{struct_name}; // Convert the idiomatic struct to the C struct at a **DIFFERENT** memory location
 unsafe fn C{struct_name}_to_{idiom_name}_mut(input: *mut C{struct_name}) -> &'static mut {idiom_name}; // Convert the C struct to the idiomatic struct at a **DIFFERENT** memory location
-'''
-            prompt += "```\n"
+''')
+            prompt_parts.append("```\n")
 
         if len(uses) > 0:
-            prompt += f'''
+            prompt_parts.append(f'''
 Following uses will be provied by the verifier, you should **ONLY** add uses that are not in the following list:
 ```rust
 {joint_uses}
 ```
-'''
+''')
 
-        prompt += '''
-Output the translated function into this format (wrap with the following tags):
-----FUNCTION----
-```rust
-// Your translated function here
-```
-----END FUNCTION----
-'''
-        if verify_result[0] == VerifyResult.COMPILE_ERROR:
-            prompt += f'''
-Lastly, the function is translated as:
-```rust
-{error_translation}
-```
-It failed to compile with the following error message:
-```
-{verify_result[1]}
-```
-Analyzing the error messages, think about the possible reasons, and try to avoid this error.
-'''
-        elif verify_result[0] == VerifyResult.TEST_ERROR or verify_result[0] == VerifyResult.TEST_TIMEOUT:
-            prompt += f'''
-Lastly, the function is translated as:
-```rust
-{error_translation}
-```
-It failed the following tests:
-```
-{verify_result[1]}
-```
-Analyze the error messages, think about the possible reasons, and try to avoid this error.
-'''
-        elif verify_result[0] != VerifyResult.SUCCESS:
-            raise NotImplementedError(
-                f'error type {verify_result[0]} not implemented')
+        prompt_parts.append(_HARNESS_PROMPT_OUTPUT_FORMAT)
 
-        # Try spec-driven function harness generation first
+        # The spec drives the harness generator in each attempt
         func_spec_path = os.path.join(
             self.result_path,
             "translated_code_idiomatic",
@@ -435,10 +493,64 @@ Analyze the error messages, think about the possible reasons, and try to avoid t
                         _notes.append(f"- {u} -> {i}: {note.strip()}")
                 if _notes:
                     hints = "\n".join(_notes)
-                    prompt += f"\nSpec hints (from SPEC.llm_note):\n{hints}\n"
+                    prompt_parts.append(f"\nSpec hints (from SPEC.llm_note):\n{hints}\n")
                     spec_hints_text = hints
             except Exception:
                 pass
+        return _FunctionHarnessSetup(
+            original_signature_renamed=original_signature_renamed,
+            idiom_decl_name=idiom_decl_name,
+            idiomatic_signature_replaced=idiomatic_signature_replaced,
+            struct_idiomatic_name_map=struct_idiomatic_name_map,
+            func_spec_path=func_spec_path,
+            spec_hints_text=spec_hints_text,
+            prompt=''.join(prompt_parts),
+        )
+
+    def _function_harness_attempt(
+        self,
+        function_name,
+        idiomatic_impl,
+        struct_signature_dependency_names: list[str],
+        setup: _FunctionHarnessSetup,
+        verify_result: tuple[VerifyResult, Optional[str]],
+        error_translation,
+        attempts: int,
+    ) -> tuple[VerifyResult, Optional[str]] | _HarnessRetry:
+        logger.info(
+            "Generating test harness for function %s (attempt %d)",
+            function_name,
+            attempts,
+        )
+        original_signature_renamed = setup.original_signature_renamed
+        idiom_decl_name = setup.idiom_decl_name
+        idiomatic_signature_replaced = setup.idiomatic_signature_replaced
+        struct_idiomatic_name_map = setup.struct_idiomatic_name_map
+        func_spec_path = setup.func_spec_path
+        spec_hints_text = setup.spec_hints_text
+
+        # Feedback from the previous attempt goes last so that retries share
+        # the longest possible prompt prefix, which providers can cache.
+        feedback_parts: list[str] = []
+        feedback_text = _HARNESS_FEEDBACK_TEXT.get(verify_result[0])
+        if feedback_text is not None:
+            failure_header, advice = feedback_text
+            feedback_parts.append(f'''
+Lastly, the function is translated as:
+```rust
+{error_translation}
+```
+{failure_header}
+```
+{verify_result[1]}
+```
+{advice}
+''')
+        elif verify_result[0] != VerifyResult.SUCCESS:
+            raise NotImplementedError(
+                f'error type {verify_result[0]} not implemented')
+
+        # Try spec-driven function harness generation first
         function_result = None
         try:
             function_result = generate_function_harness_from_spec_file(
@@ -462,8 +574,7 @@ Analyze the error messages, think about the possible reasons, and try to avoid t
                 )
                 if os.path.exists(helper_path):
                     try:
-                        with open(helper_path, 'r') as _hf:
-                            helper_blocks.append(_hf.read().strip())
+                        helper_blocks.append(utils.read_file(helper_path).strip())
                     except Exception:
                         pass
 
@@ -494,7 +605,9 @@ Current harness:
 ```
 ----END FUNCTION----
 """
-            result = self.llm.query(llm_prompt)
+            # Retries send the same prompt; a cached reply would only repeat
+            # the one that already failed.
+            result = self._query_function_block(llm_prompt, use_cache=attempts == 0)
             try:
                 llm_result = utils.parse_llm_result(result, "function")
                 function_result = llm_result["function"]
@@ -503,7 +616,9 @@ Current harness:
 
         if function_result is None:
             # TZ: when this will be called?
-            result = self.llm.query(prompt)
+            result = self._query_function_block(
+                ''.join([setup.prompt, *feedback_parts]), use_cache=attempts == 0
+            )
 
             try:
                 llm_result = utils.parse_llm_result(result, "function")
@@ -517,16 +632,7 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
 ```
 ----END FUNCTION----
 '''
-                return self._function_generate_test_harness(
-                    function_name,
-                    idiomatic_impl,
-                    original_signature,
-                    idiomatic_signature,
-                    struct_signature_dependency_names,
-                    verify_result=(VerifyResult.COMPILE_ERROR, error_message),
-                    error_translation=result,
-                    attempts=attempts+1
-                )
+                return _HarnessRetry((VerifyResult.COMPILE_ERROR, error_message), result)
 
         struct_code = {}
         function_code = {}
@@ -537,12 +643,12 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
                     if not self._hydrate_struct_harness(struct_name):
                         raise ValueError(
                             f"Struct {struct_name} test harness is not generated")
-                with open(f"{self.struct_test_harness_dir}/{struct_name}.rs") as f:
-                    struct_code[struct_name] = f.read()
+                struct_code[struct_name] = utils.read_file(
+                    f"{self.struct_test_harness_dir}/{struct_name}.rs")
 
         # Rename the actual idiomatic implementation to `{function_name}_idiomatic` using the
         # detected idiomatic name from its signature
-        function_code[function_name] = rust_ast_parser.rename_function(
+        function_code[function_name] = utils.rename_function(
             idiomatic_impl,
             idiom_decl_name,
             f"{function_name}_idiomatic"
@@ -557,8 +663,10 @@ Error: Failed to parse the result from LLM, result is not wrapped by the tags as
         if result != CombineResult.SUCCESS or compile_code is None:
             return (VerifyResult.COMPILE_ERROR, f"Failed to combine the function {function_name}")
 
+        # The harness is only saved here and rebuilt with the rest of the
+        # crate during verification, so type-checking it is enough.
         result = self.try_compile_rust_code(
-            compile_code)
+            compile_code, check_only=True)
 
         if result[0] != VerifyResult.SUCCESS:
             # If we compiled a spec-driven harness and it failed, try LLM to fix the compile errors in-place
@@ -589,33 +697,24 @@ Output only the final function in this format:
 ```
 ----END FUNCTION----
 '''
-                res2 = self.llm.query(fix_prompt)
+                res2 = self._query_function_block(fix_prompt, use_cache=attempts == 0)
                 try:
                     llm_fixed = utils.parse_llm_result(res2, "function")["function"]
                     function_code[f"{function_name}_harness"] = llm_fixed
                     combiner = PartialCombiner(function_code, struct_code)
                     result2, compile_code2 = combiner.combine()
                     if result2 == CombineResult.SUCCESS and compile_code2 is not None:
-                        result3 = self.try_compile_rust_code(compile_code2)
+                        result3 = self.try_compile_rust_code(compile_code2, check_only=True)
                         if result3[0] == VerifyResult.SUCCESS:
-                            utils.save_code(
+                            self._function_harness_code[function_name] = utils.save_code(
                                 f"{self.function_test_harness_dir}/{function_name}.rs", compile_code2)
                             return (VerifyResult.SUCCESS, None)
                 except Exception as e:
                     logger.error("LLM fix attempt failed: %s", e)
 
-            return self._function_generate_test_harness(
-                function_name,
-                idiomatic_impl,
-                original_signature,
-                idiomatic_signature,
-                struct_signature_dependency_names,
-                result,
-                function_result,
-                attempts=attempts+1
-            )
+            return _HarnessRetry(result, function_result)
 
-        utils.save_code(
+        self._function_harness_code[function_name] = utils.save_code(
             f"{self.function_test_harness_dir}/{function_name}.rs", compile_code)
 
         return (VerifyResult.SUCCESS, None)
@@ -632,22 +731,51 @@ Output only the final function in this format:
         error_translation=None,
         attempts=0,
     ) -> tuple[VerifyResult, Optional[str]]:
-        if attempts > self.max_attempts - 1:
-            logger.error(
-                "Failed to get compilable test harness for struct %s after %d attempts",
+        # Same iterative retry scheme as _function_generate_test_harness.
+        while attempts <= self.max_attempts - 1:
+            outcome = self._struct_harness_attempt(
                 struct_name,
-                self.max_attempts,
-            )
-            last_status, last_log = verify_result
-            detail = ""
-            if last_status != VerifyResult.SUCCESS and last_log:
-                detail = f"\nLast error ({last_status.name}):\n{last_log}"
-            message = (
-                f"Spec-driven harness exhausted {self.max_attempts} attempts for struct {struct_name}."
+                unidiomatic_struct_code,
+                idiomatic_struct_code,
+                struct_dependencies,
+                idiomatic_struct_name,
+                attempts,
             )
-            message += detail
-            return (VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED, message)
+            if not isinstance(outcome, _HarnessRetry):
+                return outcome
+            verify_result, error_translation = outcome
+            del outcome
+            attempts += 1
+
+        logger.error(
+            "Failed to get compilable test harness for struct %s after %d attempts",
+            struct_name,
+            self.max_attempts,
+        )
+        last_status, last_log = verify_result
+        detail = ""
+        if last_status != VerifyResult.SUCCESS and last_log:
+            detail = f"\nLast error ({last_status.name}):\n{last_log}"
+        message = (
+            f"Spec-driven harness exhausted {self.max_attempts} attempts for struct {struct_name}."
+        )
+        message += detail
+        return (VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED, message)
 
+    def _struct_harness_attempt(
+        self,
+        struct_name: str,
+        unidiomatic_struct_code: str,
+        idiomatic_struct_code: str,
+        struct_dependencies: list[StructInfo],
+        idiomatic_struct_name: str,
+        attempts: int,
+    ) -> tuple[VerifyResult, Optional[str]] | _HarnessRetry:
+        logger.info(
+            "Generating test harness for struct %s (attempt %d)",
+            struct_name,
+            attempts,
+        )
         # rename the unidiomatic struct to C struct
         unidiomatic_struct_code_renamed = rust_ast_parser.rename_struct_union(
             unidiomatic_struct_code, struct_name, f"C{struct_name}")
@@ -810,7 +938,7 @@ Output only the two functions in this format:
                         if result[0] != VerifyResult.SUCCESS:
                             return result
 
-            result = self.llm.query(prompt)
+            result = self.llm.query(prompt, use_cache=attempts == 0)
 
             try:
                 llm_result = utils.parse_llm_result(result, "function")
@@ -823,16 +951,7 @@ Output only the two functions in this format:
                     "----END FUNCTION----"
                 )
                 logger.error("%s", error_message)
-                return self._struct_generate_test_harness(
-                    struct_name,
-                    unidiomatic_struct_code,
-                    idiomatic_struct_code,
-                    struct_dependencies,
-                    idiomatic_struct_name,
-                    (VerifyResult.COMPILE_ERROR, error_message),
-                    error_translation=result,
-                    attempts=attempts+1,
-                )
+                return _HarnessRetry((VerifyResult.COMPILE_ERROR, error_message), result)
 
         # Check whether the required conversion functions exist, but defer
         # surfacing the error until after we have tried to compile the harness
@@ -844,7 +963,7 @@ Output only the two functions in this format:
         missing_funcs: list[str] = []
         signature_parse_failed = False
         try:
-            sigs = rust_ast_parser.get_func_signatures(harness_result)
+            sigs = utils.get_func_signatures(harness_result)
         except Exception:
             signature_parse_failed = True
             missing_funcs = required_funcs.copy()
@@ -862,7 +981,7 @@ Output only the two functions in this format:
                     existing_name = candidates[0]
                     if existing_name != fn_name:
                         try:
-                            harness_result = rust_ast_parser.rename_function(
+                            harness_result = utils.rename_function(
                                 harness_result,
                                 existing_name,
                                 fn_name,
@@ -876,7 +995,7 @@ Output only the two functions in this format:
                     missing_funcs.append(fn_name)
 
             if renamed:
-                sigs = rust_ast_parser.get_func_signatures(harness_result)
+                sigs = utils.get_func_signatures(harness_result)
 
             for fn_name in required_funcs:
                 if fn_name not in sigs and fn_name not in missing_funcs:
@@ -895,8 +1014,7 @@ Output only the two functions in this format:
                         f"Struct harness for {dependency_name} is missing in both build and cache "
                         "directories; expected generate_struct_harness_from_spec_file to persist it."
                     )
-            with open(harness_path) as f:
-                combine_structs[dependency_name] = f.read()
+            combine_structs[dependency_name] = utils.read_file(harness_path)
 
         save_code = '\n'.join([
             idiomatic_struct_code,
@@ -938,15 +1056,7 @@ Output only the two functions in this format:
                 + ", ".join(missing_funcs)
             )
             logger.error("%s", error_message)
-            return self._struct_generate_test_harness(
-                struct_name,
-                unidiomatic_struct_code,
-                idiomatic_struct_code,
-                struct_dependencies,
-                idiomatic_struct_name,
-                (VerifyResult.COMPILE_ERROR, error_message),
-                attempts=attempts+1,
-            )
+            return _HarnessRetry((VerifyResult.COMPILE_ERROR, error_message), None)
 
         if result[0] != VerifyResult.SUCCESS:
             coached = self._coach_struct_compile_error(
@@ -984,7 +1094,7 @@ Output only the two functions in this format:
 ```
 ----END FUNCTION----
 '''
-                res2 = self.llm.query(fix_prompt)
+                res2 = self.llm.query(fix_prompt, use_cache=attempts == 0)
                 try:
                     llm_fixed = utils.parse_llm_result(res2, "function")["function"]
                     save_code_try = '\n'.join([
@@ -1001,16 +1111,7 @@ Output only the two functions in this format:
                 except Exception as e:
                     logger.error("LLM struct fix attempt failed: %s", e)
 
-            return self._struct_generate_test_harness(
-                struct_name,
-                unidiomatic_struct_code,
-                idiomatic_struct_code,
-                struct_dependencies,
-                idiomatic_struct_name,
-                result,
-                harness_result,
-                attempts=attempts+1
-            )
+            return _HarnessRetry(result, harness_result)
 
         # Selftest gate: run minimal roundtrip before saving the harness
         try:
@@ -1063,7 +1164,11 @@ Output only the two functions in this format:
         if result != CombineResult.SUCCESS or combined_code is None:
             raise ValueError(f"Failed to combine the function {function.name}")
 
-        total, unsafe = rust_ast_parser.count_unsafe_tokens(combined_code)
+        # Code without the keyword cannot contain unsafe tokens; skip the parse
+        if "unsafe" in combined_code:
+            _, unsafe = utils.count_unsafe_tokens(combined_code)
+        else:
+            unsafe = 0
         if unsafe > 0:
             # TODO: may allow unsafe blocks in the future
             return (VerifyResult.COMPILE_ERROR, "Unsafe blocks are not allowed in the idiomatic code")
@@ -1086,7 +1191,7 @@ Output only the two functions in this format:
 
         # Determine the idiomatic function's declared name in `function_code`.
         # Prefer mapping/spec-provided idiomatic name when available.
-        idiom_sigs = rust_ast_parser.get_func_signatures(function_code)
+        idiom_sigs = utils.get_func_signatures(function_code)
         idiomatic_decl_name = None
 
         spec_path = os.path.join(
@@ -1170,19 +1275,17 @@ Output only the two functions in this format:
                     if result[0] != VerifyResult.SUCCESS:
                         return result
 
-            struct_signature_dependency_names = set()
-            for struct in struct_signature_dependencies:
-                struct_signature_dependency_names.add(struct.name)
-                for dependency in struct.dependencies:
-                    # TODO: may need to check the dependencies of the dependencies
-                    struct_signature_dependency_names.add(dependency.name)
+            # TODO: may need to check the dependencies of the dependencies
+            struct_signature_dependency_names = {
+                struct.name for struct in struct_signature_dependencies
+            } | {
+                dependency.name
+                for struct in struct_signature_dependencies
+                for dependency in struct.dependencies
+            }
 
             # remove duplicate structs in the dependencies
-            combiner_struct_pop_list = []
-            for struct_name in combiner.data_types.keys():
-                if struct_name in struct_signature_dependency_names:
-                    combiner_struct_pop_list.append(struct_name)
-            for struct_name in combiner_struct_pop_list:
+            for struct_name in struct_signature_dependency_names & combiner.data_types.keys():
                 combiner.data_types.pop(struct_name)
 
             # regenerate the combined code
@@ -1196,15 +1299,17 @@ Output only the two functions in this format:
                 combined_code_harness,
                 unidiomatic_signature,
                 idiomatic_signature,
-                list(struct_signature_dependency_names),
+                sorted(struct_signature_dependency_names),
             )
             if result[0] != VerifyResult.SUCCESS:
                 # TODO: harness feedback may not be useful
                 return result
 
             # We have had the test harness generated, now we need to run the tests
-            with open(f"{self.function_test_harness_dir}/{function_name}.rs") as f:
-                harness_code = f.read()
+            harness_code = self._function_harness_code.pop(function_name, None)
+            if harness_code is None:
+                harness_code = utils.read_file(
+                    f"{self.function_test_harness_dir}/{function_name}.rs")
 
         test_error = self._embed_test_rust(
             function,
@@ -55,6 +55,10 @@ class Verifier(ABC):
         self.compile_commands_file = compile_commands_file
         self.entry_tu_file = entry_tu_file
         self.link_closure = link_closure or []
+        # (code digest, entry-file stat) of the last successful build_attempt
+        self._last_successful_build: Optional[tuple[bytes, tuple[int, int, int]]] = None
+        # code digest -> diagnostics, for code that rustc deterministically rejected
+        self._failed_builds: dict[bytes, str] = {}
 
     def _discover_cmake_libs(self) -> list[str]:
         """Discover library flags from CMake link.txt for the entry target, if present.
@@ -259,35 +263,76 @@ class Verifier(ABC):
 
         return (VerifyResult.SUCCESS, None)
 
-    def _try_compile_rust_code_impl(self, rust_code, executable=False) -> tuple[VerifyResult, Optional[str]]:
+    def _build_attempt_state(self, executable: bool) -> Optional[tuple[int, int, int]]:
+        entry = "main.rs" if executable else "lib.rs"
+        try:
+            st = os.stat(os.path.join(self.build_attempt_path, "src", entry))
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _try_compile_rust_code_impl(self, rust_code, executable=False, check_only=False) -> tuple[VerifyResult, Optional[str]]:
+        # Re-verifying the code that was just built successfully is a no-op as
+        # long as nobody has touched the build_attempt crate since.
+        build_key = hashlib.blake2b(
+            f"{int(bool(executable))}{int(bool(check_only))}\0{rust_code}".encode("utf-8"), digest_size=16
+        ).digest()
+        last_build = self._last_successful_build
+        if last_build is not None and last_build[0] == build_key:
+            if self._build_attempt_state(executable) == last_build[1]:
+                logger.debug("Reusing previous successful build of identical Rust code")
+                return (VerifyResult.SUCCESS, None)
+        self._last_successful_build = None
+        if build_key in self._failed_builds:
+            logger.error("Rust code failed to compile (same code as an earlier attempt)")
+            return (VerifyResult.COMPILE_ERROR, self._failed_builds[build_key])
+
         utils.create_rust_proj(rust_code, "build_attempt",
                                self.build_attempt_path, is_lib=(not executable))
 
-        # Try format the Rust code
-        cmd = ["cargo", "fmt", "--manifest-path",
-               f"{self.build_attempt_path}/Cargo.toml"]
+        # Try format the Rust code. The crate has a single source file, so
+        # calling rustfmt directly spares a cargo startup per attempt.
+        entry = "main.rs" if executable else "lib.rs"
+        cmd = ["rustfmt", "--edition", "2021",
+               os.path.join(self.build_attempt_path, "src", entry)]
         result = utils.run_command(cmd)
         if result.returncode != 0:
             # Rust code failed to format, unable to compile
             logger.error("Rust code failed to format")
+            self._remember_failed_build(build_key, result.stderr)
             return (VerifyResult.COMPILE_ERROR, result.stderr)
 
-        # Try to compile the Rust code
-        cmd = ["cargo", "build", "--manifest-path",
+        # Try to compile the Rust code; `cargo check` skips codegen when the
+        # caller only needs to know whether the code compiles.
+        cmd = ["cargo", "check" if check_only else "build", "--manifest-path",
                f"{self.build_attempt_path}/Cargo.toml"]
         logger.debug("Compiling Rust project: %s", ' '.join(cmd))
         result = utils.run_command(cmd)
         if result.returncode != 0:
             # Rust code failed to compile
             logger.error("Rust code failed to compile")
+            # Only rustc rejecting the crate is a property of the code;
+            # cargo failing for other reasons (e.g. fetching libc) may be transient.
+            if "could not compile `build_attempt`" in result.stderr:
+                self._remember_failed_build(build_key, result.stderr)
             return (VerifyResult.COMPILE_ERROR, result.stderr)
         else:
             # Rust code compiled successfully
             logger.info("Rust code compiled successfully")
+            state = self._build_attempt_state(executable)
+            if state is not None:
+                self._last_successful_build = (build_key, state)
             return (VerifyResult.SUCCESS, None)
 
-    def try_compile_rust_code(self, rust_code, executable=False) -> tuple[VerifyResult, Optional[str]]:
-        return self._try_compile_rust_code_impl(rust_code, executable)
+    _MAX_FAILED_BUILDS = 256
+
+    def _remember_failed_build(self, build_key: bytes, diagnostics: str) -> None:
+        if len(self._failed_builds) >= self._MAX_FAILED_BUILDS:
+            self._failed_builds.pop(next(iter(self._failed_builds)))
+        self._failed_builds[build_key] = diagnostics
+
+    def try_compile_rust_code(self, rust_code, executable=False, check_only=False) -> tuple[VerifyResult, Optional[str]]:
+        return self._try_compile_rust_code_impl(rust_code, executable, check_only)
 
     def _load_test_cmd(self, target) -> list[list[str]]:
         test_cmd_str = read_file(self.test_cmd_path)
@@ -338,9 +383,9 @@ class Verifier(ABC):
         timeout = general_config.get('timeout_seconds', 60)
         byte_limit = general_config.get('command_output_byte_limit', 40000)
 
-        for i, cmd in enumerate(test_cmds):
-            if test_number is not None and i != test_number:
-                continue
+        cwd = os.path.dirname(os.path.abspath(self.test_cmd_path))
+
+        def run_one(i: int, cmd: list[str]) -> Optional[tuple[VerifyResult, Optional[str], Optional[int]]]:
             logger.debug("Running test command: %s", cmd)
             if valgrind:
                 cmd = valgrind_cmd + cmd
@@ -349,7 +394,7 @@ class Verifier(ABC):
                     cmd,
                     limit_bytes=byte_limit,
                     timeout=timeout,
-                    cwd=os.path.dirname(os.path.abspath(self.test_cmd_path)),
+                    cwd=cwd,
                     env=env,
                 )
             except TimeoutError as e:
@@ -371,6 +416,29 @@ class Verifier(ABC):
                     else:
                         return (VerifyResult.TEST_ERROR, "No output", i)
                 return (VerifyResult.TEST_ERROR, stderr, i)
+            return None
+
+        selected = [
+            (i, cmd) for i, cmd in enumerate(test_cmds)
+            if test_number is None or i == test_number
+        ]
+        jobs = min(utils.parallel_jobs(self.config), len(selected))
+        if jobs > 1:
+            # Test commands are independent; run them concurrently but still
+            # report the failure of the lowest-numbered one.
+            with utils.parallel_executor(jobs) as executor:
+                futures = [executor.submit(run_one, i, cmd) for i, cmd in selected]
+                for index, future in enumerate(futures):
+                    failure = future.result()
+                    if failure is not None:
+                        for pending in futures[index + 1:]:
+                            pending.cancel()
+                        return failure
+        else:
+            for i, cmd in selected:
+                failure = run_one(i, cmd)
+                if failure is not None:
+                    return failure
 
         return (VerifyResult.SUCCESS, None, None)
 
@@ -132,3 +132,28 @@ def test_combine_idiomatic(config):
         assert stat["unsafe_fraction"] == unsafe_fraction
         assert utils.normalize_string(
             combined_code) == utils.normalize_string(expected_code)
+
+
+def test_partial_combiner_recombine_matches_fresh_combine(monkeypatch):
+    from sactor.combiner import partial_combiner
+    from sactor.combiner.partial_combiner import PartialCombiner
+
+    functions = {"add": "use std::ptr;\nfn add(p: &Point) -> i32 { p.x + p.y }"}
+    data_types = {"Point": "pub struct Point { pub x: i32, pub y: i32 }"}
+
+    parsed: list[str] = []
+    real_rust_code = partial_combiner.RustCode
+
+    def counting_rust_code(code):
+        parsed.append(code)
+        return real_rust_code(code)
+
+    monkeypatch.setattr(partial_combiner, "RustCode", counting_rust_code)
+    combiner = PartialCombiner(dict(functions), dict(data_types))
+    combiner.combine()
+    combiner.data_types.pop("Point")
+    result, recombined = combiner.combine()
+
+    assert result == CombineResult.SUCCESS
+    assert len(parsed) == 2
+    assert recombined == PartialCombiner(dict(functions), {}).combine()[1]
@@ -91,4 +91,87 @@ def test_litellm_factory(config):
     
     llm = llm_factory(config)
     assert llm.default_model == "gpt-4o"
-    assert hasattr(llm, 'router')
\ No newline at end of file
+    assert hasattr(llm, 'router')
+
+
+def test_litellm_response_cache(config, tmp_path):
+    config["general"]["model"] = "gpt-4o"
+    config["general"]["llm_cache_dir"] = str(tmp_path / "llm_cache")
+    config["litellm"] = {
+        "router_settings": {},
+        "model_list": [
+            {
+                "model_name": "gpt-4o",
+                "litellm_params": {
+                    "model": "openai/gpt-4o",
+                    "api_key": "mocked_value"
+                }
+            }
+        ]
+    }
+
+    llm = llm_factory(config)
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="cached\r\nresponse"))]
+    llm.router.completion = MagicMock(return_value=mock_response)
+
+    assert llm.query("prompt") == "cached\r\nresponse"
+    assert llm.query("prompt") == "cached\r\nresponse"
+    assert llm.router.completion.call_count == 1
+
+    llm.query("another prompt")
+    assert llm.router.completion.call_count == 2
+    assert len(llm.costed_input_tokens) == 2
+
+    # Retries bypass the cache and refresh the entry
+    llm.query("prompt", use_cache=False)
+    assert llm.router.completion.call_count == 3
+
+    # A corrupt entry is a miss and gets overwritten
+    for entry in (tmp_path / "llm_cache").rglob("*.json"):
+        entry.write_text("{truncated")
+    assert llm.query("prompt") == "cached\r\nresponse"
+    assert llm.router.completion.call_count == 4
+    assert llm.query("prompt") == "cached\r\nresponse"
+    assert llm.router.completion.call_count == 4
+
+    # Sampling parameters are part of the key
+    config["litellm"]["model_list"][0]["litellm_params"]["temperature"] = 0.2
+    llm2 = llm_factory(config)
+    llm2.router.completion = MagicMock(return_value=mock_response)
+    llm2.query("prompt")
+    assert llm2.router.completion.call_count == 1
+
+
+def test_litellm_stop_records_finish_reason(config, tmp_path):
+    config["general"]["model"] = "gpt-4o"
+    config["general"]["llm_cache_dir"] = str(tmp_path / "llm_cache")
+    config["litellm"] = {
+        "router_settings": {},
+        "model_list": [
+            {
+                "model_name": "gpt-4o",
+                "litellm_params": {
+                    "model": "openai/gpt-4o",
+                    "api_key": "mocked_value"
+                }
+            }
+        ]
+    }
+
+    llm = llm_factory(config)
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content="partial"), finish_reason="stop")
+    ]
+    llm.router.completion = MagicMock(return_value=mock_response)
+
+    assert llm.query("prompt", stop=["END"]) == "partial"
+    assert llm.router.completion.call_args.kwargs["stop"] == ["END"]
+    assert llm.last_finish_reason == "stop"
+
+    llm.last_finish_reason = None
+    # A cached response keeps the finish reason of the original generation
+    assert llm.query("prompt", stop=["END"]) == "partial"
+    assert llm.router.completion.call_count == 1
+    assert llm.last_finish_reason == "stop"
@@ -1,4 +1,3 @@
-from functools import partial
 from contextlib import contextmanager
 from unittest.mock import patch
 
@@ -19,9 +18,13 @@ def llm_with_mock(mock_query_impl):
     cfg = utils.load_default_config()
     llm = llm_factory(cfg)
     original_query = LLM._query_impl
-    mock_with_original = partial(
-        mock_query_impl, original=original_query, llm_instance=llm
-    )
+
+    def mock_with_original(prompt, model=None, stop=None):
+        # Canned responses already end at the right tag, so `stop` is dropped
+        return mock_query_impl(
+            prompt, model, original=original_query, llm_instance=llm
+        )
+
     with patch('sactor.llm.llm.LLM._query_impl', side_effect=mock_with_original):
         yield llm
 
@@ -2,10 +2,12 @@ import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from sactor import utils
+from sactor import rust_ast_parser, utils
 from sactor.data_types import DataType
 
 
@@ -39,6 +41,24 @@ def test_load_config():
     assert config['general']['command_output_byte_limit'] == 40000
     assert 'litellm' in config and 'model_list' in config['litellm']
 
+def test_load_default_config_returns_independent_copies():
+    first = utils.load_default_config()
+    first['general']['model'] = 'mutated'
+    second = utils.load_default_config()
+    assert second['general']['model'] != 'mutated'
+
+
+def test_try_load_config_cache_tracks_file_changes(tmp_path):
+    config_path = tmp_path / "sactor.toml"
+    config_path.write_text('[general]\nmodel = "first"\n')
+    first = utils.try_load_config(str(config_path))
+    first['general']['model'] = 'mutated'
+    assert utils.try_load_config(str(config_path))['general']['model'] == 'first'
+
+    config_path.write_text('[general]\nmodel = "second-model"\n')
+    assert utils.try_load_config(str(config_path))['general']['model'] == 'second-model'
+
+
 def test_rename_signature():
     signature = "fn foo(a: i32, b: i32) -> i32;"
     renamed_signature = "fn bar(a: i32, b: i32) -> i32;"
@@ -76,6 +96,181 @@ def test_load_text_with_mappings_and_b2s_s2b(tmp_path):
     se = s2b[idx_zh + 1]
     for j in range(sb, se):
         assert utils.byte_to_str_index(b2s, j) == idx_zh
+    offsets = [-1, *range(len(b) + 1), len(b) + 5]
+    assert utils.byte_to_str_indices(b2s, offsets) == [
+        utils.byte_to_str_index(b2s, off) for off in offsets
+    ]
+
+
+def test_load_text_with_mappings_ascii_is_identity(tmp_path):
+    text = "int main(void) { return 0; }\n"
+    p = tmp_path / "a.c"
+    p.write_text(text, encoding="utf-8")
+    s, b, b2s, s2b = utils.load_text_with_mappings(str(p))
+    assert s == text
+    assert list(b2s) == list(range(len(b) + 1))
+    assert list(s2b) == list(range(len(s) + 1))
+    assert utils.byte_to_str_index(b2s, len(b) + 10) == len(s)
+
+
+def test_atomic_write_bytes_replaces_content(tmp_path):
+    target = tmp_path / "out.rs"
+    target.write_text("old", encoding="utf-8")
+    utils.atomic_write_bytes(str(target), "fn main() {}\n".encode("utf-8"))
+    assert target.read_text(encoding="utf-8") == "fn main() {}\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.rs"]
+
+
+def test_atomic_write_bytes_concurrent_writers(tmp_path):
+    target = tmp_path / "cache.json"
+    payloads = [bytes([65 + i]) * 200_000 for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda data: utils.atomic_write_bytes(str(target), data), payloads * 4))
+    assert target.read_bytes() in payloads
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]
+
+
+def test_read_file_normalises_newlines(tmp_path):
+    target = tmp_path / "in.c"
+    target.write_bytes("int a;\r\n// é\rint b;\n".encode("utf-8"))
+    assert utils.read_file(str(target)) == "int a;\n// é\nint b;\n"
+
+
+def test_compiler_include_paths_are_cached_on_disk(tmp_path, monkeypatch):
+    cache_file = tmp_path / "include_paths.json"
+    calls = []
+
+    def fake_probe(compiler):
+        calls.append(compiler)
+        return ("/usr/include",)
+
+    monkeypatch.setattr(utils, "_include_paths_cache_file", lambda compiler: str(cache_file))
+    monkeypatch.setattr(utils, "_run_include_path_probe", fake_probe)
+    utils._probe_compiler_include_paths.cache_clear()
+    try:
+        assert utils._probe_compiler_include_paths("cc") == ("/usr/include",)
+        utils._probe_compiler_include_paths.cache_clear()
+        assert utils._probe_compiler_include_paths("cc") == ("/usr/include",)
+    finally:
+        utils._probe_compiler_include_paths.cache_clear()
+    assert calls == ["cc"]
+
+
+def test_compiler_include_paths_cache_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    cache_file = utils._include_paths_cache_file(sys.executable)
+    assert cache_file is not None
+    assert os.path.dirname(cache_file) == str(tmp_path / "cache" / "sactor")
+
+
+def test_parallel_jobs_is_one_inside_a_parallel_worker():
+    config = {"general": {"jobs": 4}}
+    assert utils.parallel_jobs(config) == 4
+    with utils.parallel_executor(2) as executor:
+        assert executor.submit(utils.parallel_jobs, config).result() == 1
+    assert utils.parallel_jobs(config) == 4
+
+
+def test_independent_compile_batches_keep_dependencies_ordered():
+    commands = [
+        ["gcc", "-c", "a.c", "-o", "a.o"],
+        ["gcc", "-c", "b.c", "-o", "b.o"],
+        ["gcc", "-c", "b2.c", "-o", "b.o"],
+        ["ar", "rcs", "lib.a", "a.o", "b.o"],
+        ["clang", "-c", "c.c", "-o", "c.o"],
+    ]
+    assert utils._independent_compile_batches(commands) == [
+        commands[0:2],
+        [commands[2]],
+        [commands[3]],
+        [commands[4]],
+    ]
+
+
+def test_try_backup_file_uses_first_free_slot(tmp_path):
+    target = tmp_path / "out.rs"
+    (tmp_path / "out.rs.bak").write_text("0")
+    (tmp_path / "out.rs.bak.2").write_text("2")
+    target.write_text("new")
+    utils.try_backup_file(str(target))
+    assert not target.exists()
+    assert (tmp_path / "out.rs.bak.1").read_text() == "new"
+
+
+def test_save_code_skips_unchanged_content(tmp_path, monkeypatch):
+    target = tmp_path / "out.rs"
+    writes = []
+    real_write = utils.atomic_write_bytes
+
+    def counting_write(path, data):
+        writes.append(path)
+        real_write(path, data)
+
+    monkeypatch.setattr(utils, "atomic_write_bytes", counting_write)
+    utils.save_code(str(target), "fn main() {}\n", format_now=False)
+    utils.save_code(str(target), "fn main() {}\n", format_now=False)
+    assert writes == [str(target)]
+    utils.save_code(str(target), "fn other() {}\n", format_now=False)
+    assert target.read_text() == "fn other() {}\n"
+    assert len(writes) == 2
+
+
+def test_read_file_cache_sees_rewrites(tmp_path):
+    target = tmp_path / "in.c"
+    target.write_text("int a;\n")
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+    assert utils.read_file(str(target)) == "int a;\n"
+    assert utils.read_file_lines(str(target)) == ["int a;\n"]
+    target.write_text("int b;\nint c;")
+    assert utils.read_file(str(target)) == "int b;\nint c;"
+    assert utils.read_file_lines(str(target)) == ["int b;\n", "int c;"]
+
+
+def test_create_rust_proj_updates_in_place(tmp_path):
+    proj = tmp_path / "proj"
+    utils.create_rust_proj("fn main() {}\n", "proj", str(proj), is_lib=False)
+    (proj / "target").mkdir()
+    main_mtime = (proj / "src" / "main.rs").stat().st_mtime_ns
+
+    utils.create_rust_proj("fn main() {}\n", "proj", str(proj), is_lib=False)
+    assert (proj / "target").is_dir()
+    assert (proj / "src" / "main.rs").stat().st_mtime_ns == main_mtime
+
+    utils.create_rust_proj("pub fn f() {}\n", "proj", str(proj), is_lib=True)
+    assert sorted(p.name for p in (proj / "src").iterdir()) == ["lib.rs"]
+    assert (proj / "src" / "lib.rs").read_text() == "pub fn f() {}\n"
+
+
+def test_create_rust_proj_rewrite_is_newer_than_last_build(tmp_path):
+    proj = tmp_path / "proj"
+    utils.create_rust_proj("fn main() {}\n", "proj", str(proj), is_lib=False)
+    fingerprint = proj / "target" / "debug" / ".fingerprint" / "proj-0123abcd" / "dep-bin-proj"
+    fingerprint.parent.mkdir(parents=True)
+    fingerprint.write_text("")
+    # A build recorded in a later timestamp tick than the rewrite
+    build_ns = time.time_ns() + 10_000_000_000
+    os.utime(fingerprint, ns=(build_ns, build_ns))
+
+    utils.create_rust_proj("fn main() { println!(); }\n", "proj", str(proj), is_lib=False)
+    assert (proj / "src" / "main.rs").stat().st_mtime_ns > build_ns
+
+
+def test_create_rust_proj_rewrite_mtime_is_not_in_the_future(tmp_path):
+    proj = tmp_path / "proj"
+    utils.create_rust_proj("fn main() {}\n", "proj", str(proj), is_lib=False)
+    fingerprint = proj / "target" / "debug" / ".fingerprint" / "proj-0123abcd" / "dep-bin-proj"
+    fingerprint.parent.mkdir(parents=True)
+    fingerprint.write_text("")
+    main_rs = proj / "src" / "main.rs"
+    # The build started in the same timestamp tick as the rewrite
+    build_ns = main_rs.stat().st_mtime_ns
+    os.utime(fingerprint, ns=(build_ns, build_ns))
+
+    before_ns = time.time_ns()
+    utils.create_rust_proj("fn main() { println!(); }\n", "proj", str(proj), is_lib=False)
+    after_ns = time.time_ns()
+    assert build_ns < main_rs.stat().st_mtime_ns <= max(after_ns, build_ns + 1)
+    assert main_rs.stat().st_mtime_ns >= min(before_ns, build_ns + 1)
 
 
 def test_scan_ws_semicolon_bytes_with_unicode_prefix():
@@ -161,6 +356,7 @@ def test_run_command_limit_enforces_truncation():
     script = """
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 sys.stdout.write('x' * 50000)
 sys.stdout.flush()
 time.sleep(5)
@@ -182,6 +378,26 @@ def test_run_command_limit_timeout():
         )
 
 
+def test_run_command_limit_timeout_kills_sigterm_ignoring_child(monkeypatch):
+    monkeypatch.setattr(utils, "_TERMINATE_GRACE_SEC", 0.2)
+    script = """
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+print('ready', flush=True)
+time.sleep(30)
+"""
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        utils.run_command(
+            [sys.executable, "-c", script],
+            limit_bytes=1024,
+            timeout=0.5,
+        )
+    assert time.monotonic() - start < 10
+
+
 def test_run_command_check_raises():
     with pytest.raises(subprocess.CalledProcessError):
         utils.run_command(
@@ -310,3 +526,22 @@ def test_list_c_files_from_compile_commands(tmp_path):
 
     files = utils.list_c_files_from_compile_commands(str(commands_path))
     assert sorted(files) == sorted([str(a_c.resolve()), str(b_c.resolve())])
+
+
+def test_cached_parser_helpers_return_fresh_containers():
+    code = "use std::ptr;\nfn add(a: i32, b: i32) -> i32 { a + b }\n"
+    sigs = utils.get_func_signatures(code)
+    assert sigs == rust_ast_parser.get_func_signatures(code)
+    sigs.clear()
+    assert utils.get_func_signatures(code) == rust_ast_parser.get_func_signatures(code)
+
+    uses = utils.get_uses_code(code)
+    assert uses == rust_ast_parser.get_uses_code(code)
+    uses.append("use std::mem;")
+    assert utils.get_uses_code(code) == rust_ast_parser.get_uses_code(code)
+
+
+def test_save_code_returns_written_text(tmp_path):
+    path = tmp_path / "out" / "lib.rs"
+    text = utils.save_code(str(path), "fn main() {}\n", format_now=False)
+    assert text == path.read_text()
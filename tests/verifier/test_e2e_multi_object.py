@@ -55,3 +55,196 @@ def test_e2e_verifier_runs_each_executable(tmp_path, monkeypatch, e2e_config):
     assert os.path.basename(calls[1]).startswith("combined")
     # New design: reuse the same output name for each variant
     assert os.path.basename(calls[0]) == os.path.basename(calls[1])
+
+
+def test_e2e_verifier_parallel_variants_use_distinct_outputs(tmp_path, monkeypatch, e2e_config):
+    calls: list[str] = []
+
+    e2e_config["general"]["jobs"] = 2
+    monkeypatch.setattr(
+        E2EVerifier,
+        "try_compile_rust_code",
+        lambda self, code, executable: (VerifyResult.SUCCESS, None),
+    )
+
+    def fake_run_tests(self, target, env=None, test_number=None, valgrind=False):
+        calls.append(target)
+        if target.endswith("combined_1"):
+            return (VerifyResult.TEST_ERROR, "variant 1 failed", None)
+        return (VerifyResult.SUCCESS, None, None)
+
+    monkeypatch.setattr(E2EVerifier, "_run_tests", fake_run_tests)
+
+    class _Result:
+        def __init__(self):
+            self.returncode = 0
+            self.stdout = b""
+            self.stderr = b""
+
+    monkeypatch.setattr(utils, "get_compiler", lambda: "cc")
+    monkeypatch.setattr(utils, "patched_env", lambda *args, **kwargs: {})
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: _Result())
+
+    verifier = E2EVerifier(
+        test_cmd_path="tests/verifier/test_cmd.json",
+        config=e2e_config,
+        build_path=str(tmp_path),
+        is_executable=False,
+        executable_object=["tests/verifier/mock_results/test1.o", "tests/verifier/mock_results/test2.o"],
+    )
+
+    result = verifier.e2e_verify("fn main() {}")
+
+    assert result == (VerifyResult.TEST_ERROR, "variant 1 failed")
+    assert sorted(os.path.basename(c) for c in calls) == ["combined_0", "combined_1"]
+
+
+def test_e2e_verifier_skips_relinking_unchanged_inputs(tmp_path, monkeypatch, e2e_config):
+    links: list[list[str]] = []
+
+    monkeypatch.setattr(
+        E2EVerifier,
+        "try_compile_rust_code",
+        lambda self, code, executable: (VerifyResult.SUCCESS, None),
+    )
+    monkeypatch.setattr(
+        E2EVerifier,
+        "_run_tests",
+        lambda self, target, env=None, test_number=None, valgrind=False: (VerifyResult.SUCCESS, None, None),
+    )
+
+    class _Result:
+        returncode = 0
+        stdout = b""
+        stderr = b""
+
+    def fake_run(cmd, *args, **kwargs):
+        links.append(cmd)
+        with open(cmd[cmd.index("-o") + 1], "w") as f:
+            f.write("binary")
+        return _Result()
+
+    monkeypatch.setattr(utils, "get_compiler", lambda: "cc")
+    monkeypatch.setattr(utils, "patched_env", lambda *args, **kwargs: {})
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    obj = tmp_path / "main.o"
+    obj.write_bytes(b"object")
+    verifier = E2EVerifier(
+        test_cmd_path="tests/verifier/test_cmd.json",
+        config=e2e_config,
+        build_path=str(tmp_path / "build"),
+        is_executable=False,
+        executable_object=[str(obj)],
+    )
+    rust_lib = os.path.join(verifier.build_attempt_path, "target", "debug", "libbuild_attempt.so")
+    os.makedirs(os.path.dirname(rust_lib), exist_ok=True)
+    with open(rust_lib, "w") as f:
+        f.write("lib")
+
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert len(links) == 1
+
+    with open(rust_lib, "w") as f:
+        f.write("rebuilt lib")
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert len(links) == 2
+
+
+def test_e2e_verifier_skips_relinking_each_unchanged_variant(tmp_path, monkeypatch, e2e_config):
+    links: list[str] = []
+    tested: list[str] = []
+
+    monkeypatch.setattr(
+        E2EVerifier,
+        "try_compile_rust_code",
+        lambda self, code, executable: (VerifyResult.SUCCESS, None),
+    )
+
+    def fake_run_tests(self, target, env=None, test_number=None, valgrind=False):
+        with open(target) as f:
+            tested.append(f.read())
+        return (VerifyResult.SUCCESS, None, None)
+
+    monkeypatch.setattr(E2EVerifier, "_run_tests", fake_run_tests)
+
+    class _Result:
+        returncode = 0
+        stdout = b""
+        stderr = b""
+
+    def fake_run(cmd, *args, **kwargs):
+        output = cmd[cmd.index("-o") + 1]
+        links.append(os.path.basename(output))
+        with open(output, "w") as f:
+            f.write(os.path.basename(cmd[cmd.index("-o") + 2]))
+        return _Result()
+
+    monkeypatch.setattr(utils, "get_compiler", lambda: "cc")
+    monkeypatch.setattr(utils, "patched_env", lambda *args, **kwargs: {})
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    objects = []
+    for name in ("a.o", "b.o"):
+        obj = tmp_path / name
+        obj.write_bytes(b"object")
+        objects.append(str(obj))
+    verifier = E2EVerifier(
+        test_cmd_path="tests/verifier/test_cmd.json",
+        config=e2e_config,
+        build_path=str(tmp_path / "build"),
+        is_executable=False,
+        executable_object=objects,
+    )
+    rust_lib = os.path.join(verifier.build_attempt_path, "target", "debug", "libbuild_attempt.so")
+    os.makedirs(os.path.dirname(rust_lib), exist_ok=True)
+    with open(rust_lib, "w") as f:
+        f.write("lib")
+
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert links == ["combined_0", "combined_1"]
+    # Each run tests the binary of its own variant
+    assert tested == ["a.o", "b.o", "a.o", "b.o"]
+
+
+def test_e2e_verifier_tests_identical_binaries_once(tmp_path, monkeypatch, e2e_config):
+    calls: list[str] = []
+
+    monkeypatch.setattr(
+        E2EVerifier,
+        "try_compile_rust_code",
+        lambda self, code, executable: (VerifyResult.SUCCESS, None),
+    )
+
+    def fake_run_tests(self, target, env=None, test_number=None, valgrind=False):
+        calls.append(target)
+        return (VerifyResult.SUCCESS, None, None)
+
+    monkeypatch.setattr(E2EVerifier, "_run_tests", fake_run_tests)
+
+    class _Result:
+        returncode = 0
+        stdout = b""
+        stderr = b""
+
+    def fake_run(cmd, *args, **kwargs):
+        with open(cmd[cmd.index("-o") + 1], "w") as f:
+            f.write("same binary")
+        return _Result()
+
+    monkeypatch.setattr(utils, "get_compiler", lambda: "cc")
+    monkeypatch.setattr(utils, "patched_env", lambda *args, **kwargs: {})
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    verifier = E2EVerifier(
+        test_cmd_path="tests/verifier/test_cmd.json",
+        config=e2e_config,
+        build_path=str(tmp_path),
+        is_executable=False,
+        executable_object=["tests/verifier/mock_results/test1.o", "tests/verifier/mock_results/test2.o"],
+    )
+
+    assert verifier.e2e_verify("fn main() {}") == (VerifyResult.SUCCESS, None)
+    assert len(calls) == 1
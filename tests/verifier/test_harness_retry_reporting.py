@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+from sactor import utils
 from sactor.verifier.idiomatic_verifier import IdiomaticVerifier
 from sactor.verifier.verifier_types import VerifyResult
 
@@ -58,3 +59,65 @@ def test_struct_harness_max_attempts_reports_last_error(tmp_path):
     )
     assert status == VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED
     assert message is not None and "struct compile log" in message
+
+
+def test_function_harness_retries_until_max_attempts(tmp_path):
+    verifier = _make_verifier(tmp_path, max_attempts=3)
+    prompts: list[str] = []
+    cache_flags: list[bool] = []
+
+    class _UnparsableLLM:
+        def query(self, prompt: str, stop=None, use_cache=True) -> str:
+            prompts.append(prompt)
+            cache_flags.append(use_cache)
+            return "no tags here"
+
+    verifier.llm = _UnparsableLLM()
+    status, message = verifier._function_generate_test_harness(
+        "update",
+        idiomatic_impl="pub fn update() {}",
+        original_signature="pub fn update();",
+        idiomatic_signature="pub fn update();",
+        struct_signature_dependency_names=[],
+    )
+    assert status == VerifyResult.TEST_HARNESS_MAX_ATTEMPTS_EXCEEDED
+    assert len(prompts) == verifier.max_attempts
+    assert message is not None and "Failed to parse the result from LLM" in message
+    # Every retry carries the previous attempt's output as feedback
+    assert all("no tags here" in prompt for prompt in prompts[1:])
+    # Only the first attempt may be served from the response cache
+    assert cache_flags == [True, False, False]
+
+
+def test_function_block_query_restores_end_tag(tmp_path):
+    verifier = _make_verifier(tmp_path)
+    stops: list = []
+
+    class _StoppingLLM:
+        last_finish_reason = None
+
+        def query(self, prompt: str, stop=None, use_cache=True) -> str:
+            stops.append(stop)
+            # Providers cut the response right before the stop sequence
+            self.last_finish_reason = "stop"
+            return "----FUNCTION----\n```rust\nfn harness() {}\n```\n"
+
+    verifier.llm = _StoppingLLM()
+    response = verifier._query_function_block("prompt")
+    assert stops == [["----END FUNCTION----"]]
+    assert utils.parse_llm_result(response, "function")["function"].strip() == "fn harness() {}"
+
+
+def test_function_block_query_keeps_truncated_reply(tmp_path):
+    verifier = _make_verifier(tmp_path)
+    truncated = "----FUNCTION----\n```rust\nfn harness() {\n    let x ="
+
+    class _TruncatedLLM:
+        last_finish_reason = None
+
+        def query(self, prompt: str, stop=None, use_cache=True) -> str:
+            self.last_finish_reason = "length"
+            return truncated
+
+    verifier.llm = _TruncatedLLM()
+    assert verifier._query_function_block("prompt") == truncated
@@ -1,3 +1,5 @@
+import json
+
 from sactor import utils
 from sactor.verifier import UnidiomaticVerifier, VerifyResult
 
@@ -50,3 +52,15 @@ def test_run_timeout():
     print(result[1])
 
 
+def test_run_tests_parallel_reports_first_failure(tmp_path, monkeypatch):
+    test_cmd_path = tmp_path / "test_cmd.json"
+    test_cmd_path.write_text(json.dumps([
+        {"command": "true"},
+        {"command": ["sh", "-c", "sleep 0.2; echo first >&2; exit 1"]},
+        {"command": ["sh", "-c", "echo second >&2; exit 1"]},
+        {"command": "true"},
+    ]))
+    verifier = get_unidiomatic_verifier(str(test_cmd_path))
+    verifier.config['general']['jobs'] = 4
+    result = verifier._run_tests("")
+    assert result == (VerifyResult.TEST_ERROR, "first\n", 1)
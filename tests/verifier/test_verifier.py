@@ -76,10 +76,10 @@ def test_embed_test_wrong(c_parser, rust_code, config):
     print(result[1])
 
 
-def test_mutate_c_code():
+def test_mutate_c_code(config):
     file_path = "tests/verifier/mutation_test.c"
     c_parser = CParser(file_path)
-    verifier = UnidiomaticVerifier.__new__(UnidiomaticVerifier)
+    verifier = UnidiomaticVerifier("tests/verifier/test_cmd.json", config)
 
     with tempfile.TemporaryDirectory() as tmpdir:
         add = c_parser.get_function_info("add")
@@ -215,3 +215,27 @@ fn my_function() -> i32 {
         function_dependency_uses=dependency_uses,
         has_prefix=False
     )
+
+
+def test_try_compile_rust_code_reuses_rustc_rejection(tmp_path, monkeypatch, config):
+    from sactor import utils
+
+    commands: list[list[str]] = []
+
+    def fake_run_command(cmd, *args, **kwargs):
+        commands.append(cmd)
+        if cmd[0] == "cargo":
+            return utils.ProcessResult(
+                "", "error[E0425]: cannot find value `x`\nerror: could not compile `build_attempt`", 101)
+        return utils.ProcessResult("", "", 0)
+
+    monkeypatch.setattr(utils, "run_command", fake_run_command)
+    verifier = UnidiomaticVerifier(
+        "tests/verifier/test_cmd.json", config=config, build_path=str(tmp_path))
+
+    first = Verifier.try_compile_rust_code(verifier, "fn f() -> i32 { x }")
+    second = Verifier.try_compile_rust_code(verifier, "fn f() -> i32 { x }")
+
+    assert first[0] == VerifyResult.COMPILE_ERROR
+    assert second == first
+    assert [cmd[0] for cmd in commands] == ["rustfmt", "cargo"]